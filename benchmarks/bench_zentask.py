@@ -0,0 +1,252 @@
+# Reproducible benchmarks for task rendering, persistence, theme switching,
+# timer jitter and GUI startup.
+#
+#   python benchmarks/bench_zentask.py --sizes 100,1000,10000 --output results.json
+#   python benchmarks/bench_zentask.py --compare benchmarks/baseline.json --threshold 0.25
+#   python benchmarks/bench_zentask.py --save-baseline benchmarks/baseline.json
+#
+# Tk cases need a display; without one the script starts Xvfb when it is
+# installed and otherwise skips them.
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zentask_core import DataManager, JournalDataManager, SQLiteDataManager, BinaryDataManager, TaskStore, Task, ensure_task_ids
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+WORDS = "plan write review fix ship call email draft test refactor design read sync deploy measure".split()
+
+def make_dataset(size, seed=42):
+    rng = random.Random(seed)
+    data = DataManager.default_data()
+    data['tasks'] = [Task(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))) + f" #{i}",
+        rng.random() < 0.3,
+        rng.choice(['High', 'Medium', 'Low']),
+    ) for i in range(size)]
+    ensure_task_ids(data)
+    return data
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_queries(results, size, data):
+    store = TaskStore(DataManager(os.devnull), data)
+    for filter_val in TaskStore.FILTERS:
+        for sort_val in TaskStore.SORTS:
+            results[f"query.{filter_val}.{sort_val}.{size}.s"] = timed(lambda: store.query(filter_val, sort_val))
+    for search in ('re', 'review fix', f"#{size // 2}"):
+        results[f"search.{search}.{size}.s"] = timed(lambda: store.entries('All', search))
+
+def bench_persistence(results, size, data, workdir):
+    path = os.path.join(workdir, f"json-{size}.json")
+    mgr = DataManager(path)
+    results[f"save.json.{size}.s"] = timed(lambda: mgr.save_data(data))
+    results[f"load.json.{size}.s"] = timed(mgr.load_data)
+    results[f"size.json.{size}.bytes"] = os.path.getsize(path)
+
+    journal_path = os.path.join(workdir, f"journal-{size}.json")
+    shutil.copy(path, journal_path)
+    journal = JournalDataManager(journal_path, compact_interval=float('inf'))
+    loaded = journal.load_data()
+    start = time.perf_counter()
+    for _ in range(1000):
+        journal.add_xp(loaded, 1)
+    results[f"journal.commit.{size}.s"] = (time.perf_counter() - start) / 1000
+    results[f"journal.flush.{size}.s"] = timed(journal.flush, repeat=1)
+    results[f"journal.compact.{size}.s"] = timed(journal.compact, repeat=1)
+    journal.close()
+    results[f"load.journal.{size}.s"] = timed(lambda: load_and_close(JournalDataManager(journal_path)))
+
+    binary_path = os.path.join(workdir, f"binary-{size}.ztb")
+    binary = BinaryDataManager(binary_path)
+    results[f"save.binary.{size}.s"] = timed(lambda: binary.save_data(data))
+    results[f"load.binary.{size}.s"] = timed(binary.load_data)
+    results[f"size.binary.{size}.bytes"] = os.path.getsize(binary_path)
+    results[f"memory.dicts.{size}.bytes_per_task"] = loaded_bytes(lambda: read_json(path)) / size
+    results[f"memory.json.{size}.bytes_per_task"] = loaded_bytes(mgr.read_file) / size
+    results[f"memory.binary.{size}.bytes_per_task"] = loaded_bytes(binary.read_file) / size
+
+    db_path = os.path.join(workdir, f"sqlite-{size}.db")
+    results[f"migrate.sqlite.{size}.s"] = timed(lambda: load_and_close(SQLiteDataManager(db_path, path)), repeat=1)
+    results[f"load.sqlite.{size}.s"] = timed(lambda: load_and_close(SQLiteDataManager(db_path, path)))
+    results[f"size.sqlite.{size}.bytes"] = os.path.getsize(db_path)
+
+def loaded_bytes(load):
+    # what the loaded data keeps alive: records, strings, ids and the list;
+    # memory.dicts is the plain json.load() layout tasks had before Task
+    tracemalloc.start()
+    data = load()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del data
+    return current
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def load_and_close(mgr):
+    mgr.load_data()
+    mgr.close()
+
+def ensure_display():
+    if sys.platform != 'linux' or os.environ.get('DISPLAY'):
+        return None
+    if not shutil.which('Xvfb'):
+        return None
+    display = f":{random.randint(100, 900)}"
+    proc = subprocess.Popen(['Xvfb', display, '-screen', '0', '1024x900x24'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1.0)
+    os.environ['DISPLAY'] = display
+    return proc
+
+def bench_tk(results, sizes, workdir, jitter_seconds):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipping Tk benchmarks: {e}")
+        return
+    root.destroy()
+
+    os.environ['ZENTASK_AUDIO'] = 'null'
+    os.environ['ZENTASK_STORAGE'] = 'json'
+    from focus_app import ZenTaskChronos
+
+    cwd = os.getcwd()
+    for size in sizes:
+        run_dir = os.path.join(workdir, f"tk-{size}")
+        os.makedirs(run_dir, exist_ok=True)
+        DataManager(os.path.join(run_dir, 'zentask_data.json')).save_data(make_dataset(size))
+        os.chdir(run_dir)
+        try:
+            root = tk.Tk()
+            app = ZenTaskChronos(root)
+            while app.core is None:
+                root.update()
+                time.sleep(0.005)
+            results[f"startup.first_paint.{size}.ms"] = app.startup['first_paint_ms']
+            results[f"startup.data_loaded.{size}.ms"] = app.startup['data_loaded_ms']
+            app.notebook.select(app.tab_tasks)
+            root.update()
+            for filter_val in TaskStore.FILTERS:
+                for sort_val in TaskStore.SORTS:
+                    app.var_filter.set(filter_val)
+                    app.var_sort.set(sort_val)
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    app.render_tasks()
+                    root.update_idletasks()
+                    results[f"render.{filter_val}.{sort_val}.{size}.s"] = time.perf_counter() - start
+                    results[f"render.{filter_val}.{sort_val}.{size}.peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+
+            for _ in range(20):
+                app.render_tasks()
+            root.update_idletasks()
+            for theme in ('light', 'dark'):
+                start = time.perf_counter()
+                app.change_theme(theme)
+                root.update_idletasks()
+                results[f"theme.{theme}.{size}.s"] = time.perf_counter() - start
+            results[f"theme.live_widgets.{size}.count"] = app.theme_registry.live_count()
+
+            if size == sizes[0] and jitter_seconds > 0:
+                app.scheduler.jitter.clear()
+                deadline = time.monotonic() + jitter_seconds
+                while time.monotonic() < deadline:
+                    root.update()
+                    time.sleep(0.005)
+                for key, value in app.scheduler.jitter_stats().items():
+                    results[f"jitter.{key}"] = value
+            app.on_close()
+        finally:
+            os.chdir(cwd)
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, base in baseline.get('results', {}).items():
+        current = results.get(key)
+        if current is None or key.endswith('.count') or key == 'jitter.samples':
+            continue
+        if base > 0 and current > base * (1 + threshold):
+            regressions.append((key, base, current))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ZenTask Chronos benchmarks")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--compare', help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument('--save-baseline', help="write the results as a new baseline")
+    parser.add_argument('--no-tk', action='store_true', help="skip the Tk rendering/theme/jitter cases")
+    parser.add_argument('--jitter-seconds', type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='zentask-bench-')
+    xvfb = None
+    try:
+        for size in sizes:
+            data = make_dataset(size)
+            bench_queries(results, size, data)
+            bench_persistence(results, size, data, workdir)
+            print(f"core benchmarks done for {size} tasks")
+        if not args.no_tk:
+            xvfb = ensure_display()
+            bench_tk(results, sizes, workdir, args.jitter_seconds)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for key, base, current in regressions:
+            print(f"REGRESSION {key}: {base:.6g} -> {current:.6g} (+{(current / base - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -1,486 +1,1167 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, Menu
-import math
-import json
-import os
-from datetime import datetime, date
-import platform
-import sys
-
-if platform.system() == 'Windows':
-    import winsound
-
-DATA_FILE = "zentask_data.json"
-
-class DataManager:
-    def __init__(self, filename=DATA_FILE):
-        self.filename = filename
-
-    def save_data(self, data):
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=4)
-        except IOError as e:
-            print(f"Error saving data: {e}")
-
-    def load_data(self):
-        default_data = {
-            'tasks': [],
-            'timer_settings': {'mode': 'Focus', 'seconds': 25 * 60},
-            'custom_timer_settings': {'focus_time': 25, 'short_break_time': 5, 'long_break_time': 15},
-            'pomodoro_cycle': 0,
-            'current_filter': 'All',
-            'current_sort_order': 'None',
-            'completed_focus_sessions': 0,
-            'total_focus_time': 0,
-            'current_theme': 'dark',
-            'xp': 0,
-            'level': 1
-        }
-
-        if not os.path.exists(self.filename):
-            return default_data
-        try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
-                for key, value in default_data.items():
-                    if key not in data:
-                        data[key] = value
-                return data
-        except (IOError, json.JSONDecodeError):
-            return default_data
-
-class ThemeManager:
-    def __init__(self, root, style_obj, initial_theme='dark'):
-        self.root = root
-        self.style = style_obj
-        self.current_theme = initial_theme
-        
-        self.themes = {
-            'dark': {
-                'bg': '#0f172a', 'card': '#1e293b', 'text': '#f1f5f9', 
-                'text_dim': '#94a3b8', 'primary': '#6366f1', 
-                'secondary': '#f59e0b', 'success': '#10b981', 'danger': '#ef4444',
-                'accent': '#818cf8'
-            },
-            'light': {
-                'bg': '#f8fafc', 'card': '#ffffff', 'text': '#1e293b', 
-                'text_dim': '#64748b', 'primary': '#4f46e5', 
-                'secondary': '#f97316', 'success': '#16a34a', 'danger': '#dc2626',
-                'accent': '#a5b4fc'
-            }
-        }
-        self.colors = self.themes[self.current_theme]
-        self.apply_theme()
-
-    def switch_theme(self, theme_name):
-        if theme_name in self.themes:
-            self.current_theme = theme_name
-            self.apply_theme()
-            return True
-        return False
-
-    def apply_theme(self):
-        self.colors = self.themes[self.current_theme]
-        self.root.configure(bg=self.colors['bg'])
-        self.setup_styles()
-
-    def setup_styles(self):
-        self.style.theme_use('clam')
-        c = self.colors
-        
-        self.style.configure('TFrame', background=c['bg'])
-        self.style.configure('Card.TFrame', background=c['card'], relief='flat')
-        
-        self.style.configure('TLabel', background=c['bg'], foreground=c['text'], font=('Segoe UI', 11))
-        self.style.configure('Card.TLabel', background=c['card'], foreground=c['text'], font=('Segoe UI', 11))
-        self.style.configure('Header.TLabel', background=c['bg'], foreground=c['text'], font=('Segoe UI', 22, 'bold'))
-        self.style.configure('Stat.TLabel', background=c['card'], foreground=c['primary'], font=('Segoe UI', 24, 'bold'))
-        
-        self.style.configure('TButton', font=('Segoe UI', 11, 'bold'), borderwidth=0, background=c['card'], foreground=c['text'], focuscolor=c['bg'], padding=8)
-        self.style.map('TButton', background=[('active', c['text_dim']), ('pressed', c['text_dim'])], foreground=[('active', 'white')])
-        
-        self.style.configure('Primary.TButton', background=c['primary'], foreground='white', font=('Segoe UI', 12, 'bold'), borderwidth=0, padding=10)
-        self.style.map('Primary.TButton', background=[('active', c['accent']), ('pressed', c['secondary'])], foreground=[('active', 'white'), ('pressed', 'white')])
-
-        self.style.configure('Secondary.TButton', background=c['secondary'], foreground='white', font=('Segoe UI', 12, 'bold'), borderwidth=0, padding=10)
-        self.style.map('Secondary.TButton', background=[('active', c['primary']), ('pressed', c['accent'])])
-
-        self.style.configure('Danger.TButton', background=c['danger'], foreground='white', font=('Segoe UI', 10, 'bold'), borderwidth=0, padding=8)
-        self.style.map('Danger.TButton', background=[('active', '#dc2626'), ('pressed', '#991b1b')])
-
-        self.style.configure('TEntry', fieldbackground=c['card'], foreground=c['text'], insertcolor=c['primary'], borderwidth=1, relief='solid', padding=5)
-        self.style.configure('TSpinbox', fieldbackground=c['card'], foreground=c['text'], arrowcolor=c['text'], borderwidth=1, relief='solid')
-        self.style.configure('TCombobox', fieldbackground=c['card'], foreground=c['text'], selectbackground=c['primary'], borderwidth=1, relief='solid')
-        
-        self.style.configure('TNotebook', background=c['bg'], borderwidth=0)
-        self.style.configure('TNotebook.Tab', background=c['bg'], foreground=c['text_dim'], padding=[20, 10], font=('Segoe UI', 11, 'bold'))
-        self.style.map('TNotebook.Tab', background=[('selected', c['card'])], foreground=[('selected', c['primary'])])
-
-    def apply_to_widget(self, widget, role, state=None):
-        c = self.colors
-        try:
-            if role == 'root': widget.configure(bg=c['bg'])
-            elif role == 'canvas': widget.configure(bg=c['card'], highlightthickness=0)
-            elif isinstance(widget, tk.Label):
-                if role == 'card_label': widget.configure(bg=c['card'], fg=c['text'])
-                else: widget.configure(bg=c['bg'], fg=c['text'])
-            elif isinstance(widget, tk.Frame):
-                if role == 'card': widget.configure(bg=c['card'])
-                else: widget.configure(bg=c['bg'])
-            elif isinstance(widget, tk.Entry):
-                 widget.configure(bg=c['card'], fg=c['text'], insertbackground=c['text'])
-        except:
-            pass
-
-class ZenTaskChronos:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("ZenTask Chronos")
-        self.root.geometry("600x800")
-        
-        icon_path = os.path.join(os.path.dirname(__file__), 'icon.ico')
-        if os.path.exists(icon_path):
-            try:
-                self.root.iconbitmap(icon_path)
-            except Exception as e:
-                print(f"Icon load error: {e}")
-        
-        self.data_mgr = DataManager()
-        self.data = self.data_mgr.load_data()
-        
-        self.theme_mgr = ThemeManager(root, ttk.Style(), self.data['current_theme'])
-        self.widgets_to_theme = []
-
-        self.timer_running = False
-        self.timer_seconds = self.data['timer_settings']['seconds']
-        self.current_mode = self.data['timer_settings']['mode']
-        
-        self.var_filter = tk.StringVar(value=self.data['current_filter'])
-        self.var_sort = tk.StringVar(value=self.data['current_sort_order'])
-        self.var_focus_time = tk.IntVar(value=self.data['custom_timer_settings']['focus_time'])
-        self.var_short_break = tk.IntVar(value=self.data['custom_timer_settings']['short_break_time'])
-        self.var_long_break = tk.IntVar(value=self.data['custom_timer_settings']['long_break_time'])
-
-        self.setup_ui()
-        self.update_clock()
-        self.run_timer()
-
-    def play_sound(self, sound_type='notification'):
-        try:
-            if platform.system() == 'Windows':
-                if sound_type == 'notification':
-                    winsound.Beep(1000, 300)
-                elif sound_type == 'success':
-                    winsound.Beep(1200, 150)
-                    self.root.after(200, lambda: winsound.Beep(1400, 150))
-                elif sound_type == 'warning':
-                    winsound.Beep(800, 200)
-                    self.root.after(250, lambda: winsound.Beep(600, 200))
-            else:
-                import os
-                os.system('play -nq -t alsa synth 0.3 sine 1000' if sys.platform != 'darwin' else 'afplay /System/Library/Sounds/Glass.aiff')
-        except Exception as e:
-            print(f"Sound error: {e}")
-
-    def setup_ui(self):
-        menubar = Menu(self.root)
-        self.root.config(menu=menubar)
-        view_menu = Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Theme", menu=view_menu)
-        view_menu.add_command(label="Dark Mode", command=lambda: self.change_theme('dark'))
-        view_menu.add_command(label="Light Mode", command=lambda: self.change_theme('light'))
-        help_menu = Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Help", menu=help_menu)
-        help_menu.add_command(label="About", command=lambda: messagebox.showinfo("About", "ZenTask Chronos v1.0"))
-
-        self.main_container = ttk.Frame(self.root, padding=20)
-        self.main_container.pack(fill='both', expand=True)
-
-        header_frame = ttk.Frame(self.main_container)
-        header_frame.pack(fill='x', pady=(0, 25))
-        
-        lbl_title = ttk.Label(header_frame, text="🎯 ZenTask Chronos", style='Header.TLabel')
-        lbl_title.pack(side='left')
-        
-        self.lbl_level = ttk.Label(header_frame, text=f"⭐ Lvl {self.data['level']} • {self.data['xp']} XP", style='Card.TLabel', font=("Segoe UI", 13, "bold"))
-        self.lbl_level.pack(side='right', pady=10)
-
-        self.notebook = ttk.Notebook(self.main_container)
-        self.notebook.pack(fill='both', expand=True)
-        
-        self.tab_timer = ttk.Frame(self.notebook, style='Card.TFrame', padding=20)
-        self.tab_tasks = ttk.Frame(self.notebook, style='Card.TFrame', padding=20)
-        self.tab_stats = ttk.Frame(self.notebook, style='Card.TFrame', padding=20)
-        
-        self.notebook.add(self.tab_timer, text=' Timer ')
-        self.notebook.add(self.tab_tasks, text=' Tasks ')
-        self.notebook.add(self.tab_stats, text=' Stats ')
-
-        self.setup_timer_tab()
-        self.setup_tasks_tab()
-        self.setup_stats_tab()
-
-    def setup_timer_tab(self):
-        self.clock_canvas = tk.Canvas(self.tab_timer, width=220, height=220, highlightthickness=0)
-        self.clock_canvas.pack(pady=(10, 20))
-        self.theme_mgr.apply_to_widget(self.clock_canvas, 'canvas')
-        self.register_widget(self.clock_canvas, 'canvas')
-
-        self.lbl_timer = ttk.Label(self.tab_timer, text="25:00", font=("Segoe UI", 64, "bold"), style='Card.TLabel')
-        self.lbl_timer.pack(pady=20)
-
-        btn_frame = ttk.Frame(self.tab_timer, style='Card.TFrame')
-        btn_frame.pack(pady=25)
-
-        self.btn_start = ttk.Button(btn_frame, text="▶ START FOCUS", command=self.toggle_timer, style='Primary.TButton', width=18)
-        self.btn_start.pack(side='left', padx=12)
-
-        btn_reset = ttk.Button(btn_frame, text="↻ RESET", command=self.reset_timer, style='TButton', width=12)
-        btn_reset.pack(side='left', padx=12)
-        
-        mode_frame = ttk.Frame(self.tab_timer, style='Card.TFrame')
-        mode_frame.pack(pady=20)
-        for m, t in [("⏱ Focus", 25), ("☕ Short Break", 5), ("🌙 Long Break", 15)]:
-            ttk.Button(mode_frame, text=m, style='TButton', command=lambda mod=m.split()[0], tim=t: self.set_mode(mod, tim)).pack(side='left', padx=8)
-
-    def setup_tasks_tab(self):
-        input_frame = ttk.Frame(self.tab_tasks, style='Card.TFrame')
-        input_frame.pack(fill='x', pady=(0, 20))
-        
-        self.entry_task = ttk.Entry(input_frame, font=("Segoe UI", 12))
-        self.entry_task.pack(side='left', fill='x', expand=True, padx=(0, 12))
-        self.entry_task.bind('<Return>', lambda e: self.add_task())
-        
-        btn_add = ttk.Button(input_frame, text="➕ ADD", command=self.add_task, style='Primary.TButton', width=8)
-        btn_add.pack(side='right')
-
-        filter_frame = ttk.Frame(self.tab_tasks, style='Card.TFrame')
-        filter_frame.pack(fill='x', pady=(0, 15))
-        
-        ttk.Label(filter_frame, text="Filter:", style='Card.TLabel', font=("Segoe UI", 11, "bold")).pack(side='left', padx=(0, 8))
-        cb_filter = ttk.Combobox(filter_frame, textvariable=self.var_filter, values=['All', 'Completed', 'Pending'], state='readonly', width=12)
-        cb_filter.pack(side='left', padx=(0, 20))
-        cb_filter.bind('<<ComboboxSelected>>', lambda e: self.render_tasks())
-        
-        ttk.Label(filter_frame, text="Sort:", style='Card.TLabel', font=("Segoe UI", 11, "bold")).pack(side='left', padx=(0, 8))
-        cb_sort = ttk.Combobox(filter_frame, textvariable=self.var_sort, values=['None', 'Priority'], state='readonly', width=12)
-        cb_sort.pack(side='left')
-        cb_sort.bind('<<ComboboxSelected>>', lambda e: self.render_tasks())
-
-        self.canvas_tasks = tk.Canvas(self.tab_tasks, highlightthickness=0)
-        self.scrollbar_tasks = ttk.Scrollbar(self.tab_tasks, orient="vertical", command=self.canvas_tasks.yview)
-        self.task_list_frame = ttk.Frame(self.canvas_tasks, style='Card.TFrame')
-        
-        self.canvas_tasks.create_window((0, 0), window=self.task_list_frame, anchor="nw")
-        self.canvas_tasks.configure(yscrollcommand=self.scrollbar_tasks.set)
-        
-        self.canvas_tasks.pack(side='left', fill='both', expand=True)
-        self.scrollbar_tasks.pack(side='right', fill='y')
-        
-        self.task_list_frame.bind("<Configure>", lambda e: self.canvas_tasks.configure(scrollregion=self.canvas_tasks.bbox("all")))
-        self.theme_mgr.apply_to_widget(self.canvas_tasks, 'canvas')
-        self.register_widget(self.canvas_tasks, 'canvas')
-        
-        self.render_tasks()
-
-    def setup_stats_tab(self):
-        stats_container = ttk.Frame(self.tab_stats, style='Card.TFrame')
-        stats_container.pack(fill='both', expand=True)
-        
-        def create_card(parent, title, value_var):
-            f = tk.Frame(parent, bg=self.theme_mgr.colors['card'], bd=2, relief='raised')
-            f.pack(fill='x', pady=15, padx=10, ipadx=15, ipady=15)
-            self.register_widget(f, 'card')
-            
-            tk.Label(f, text=title, font=("Segoe UI", 11, "bold"), fg=self.theme_mgr.colors['text_dim'], bg=self.theme_mgr.colors['card']).pack(anchor='w', pady=(0, 8))
-            l = tk.Label(f, textvariable=value_var, font=("Segoe UI", 32, "bold"), fg=self.theme_mgr.colors['primary'], bg=self.theme_mgr.colors['card'])
-            l.pack(anchor='w')
-            self.register_widget(f.winfo_children()[0], 'card_label_dim')
-            self.register_widget(l, 'stat_value')
-            return f
-
-        self.var_sessions = tk.StringVar(value=str(self.data['completed_focus_sessions']))
-        self.var_time = tk.StringVar(value=f"{self.data['total_focus_time']} m")
-        
-        create_card(stats_container, "Total Sessions Completed", self.var_sessions)
-        create_card(stats_container, "Total Focus Time", self.var_time)
-
-   
-    def set_mode(self, mode, minutes):
-        self.timer_running = False
-        mode_map = {'⏱': 'Focus', '☕': 'Short Break', '🌙': 'Long Break'}
-        self.current_mode = mode_map.get(mode, mode)
-        self.timer_seconds = minutes * 60
-        self.update_timer_display()
-        self.btn_start.config(text="START FOCUS")
-
-    def toggle_timer(self):
-        self.timer_running = not self.timer_running
-        if self.timer_running:
-            self.btn_start.config(text="⏸ PAUSE", style='Secondary.TButton')
-            self.run_timer()
-        else:
-            self.btn_start.config(text="▶ RESUME", style='Primary.TButton')
-
-    def run_timer(self):
-        if self.timer_running and self.timer_seconds > 0:
-            self.timer_seconds -= 1
-            self.update_timer_display()
-            self.root.after(1000, self.run_timer)
-            
-            if self.current_mode == 'Focus' and self.timer_seconds % 60 == 0:
-                self.add_xp(1)
-                
-        elif self.timer_seconds == 0:
-            self.timer_running = False
-            self.btn_start.config(text="▶ START FOCUS", style='Primary.TButton')
-            self.play_sound('success')
-            if self.current_mode == 'Focus':
-                self.complete_session()
-            else:
-                self.play_sound('notification')
-                messagebox.showinfo("ZenTask Chronos", "☕ Break Over! Time to focus.")
-
-    def complete_session(self):
-        self.data['completed_focus_sessions'] += 1
-        self.data['total_focus_time'] += (self.data['custom_timer_settings']['focus_time'])
-        self.var_sessions.set(str(self.data['completed_focus_sessions']))
-        self.var_time.set(f"{self.data['total_focus_time']} m")
-        self.add_xp(50)
-        self.play_sound('success')
-        self.save()
-        messagebox.showinfo("🎉 Session Complete!", "Session Complete! 🎉 +50 XP")
-
-    def add_xp(self, amount):
-        self.data['xp'] += amount
-        new_level = (self.data['xp'] // 100) + 1
-        if new_level > self.data['level']:
-            self.data['level'] = new_level
-            self.play_sound('success')
-            messagebox.showinfo("⭐ Level Up!", f"You reached Level {new_level}! ⭐")
-        self.lbl_level.config(text=f"⭐ Lvl {self.data['level']} • {self.data['xp']} XP")
-        self.save()
-
-    def add_task(self):
-        text = self.entry_task.get().strip()
-        if text:
-            self.data['tasks'].append({'text': text, 'completed': False, 'priority': 'Medium'})
-            self.entry_task.delete(0, 'end')
-            self.play_sound('notification')
-            self.save()
-            self.render_tasks()
-
-    def render_tasks(self):
-        for widget in self.task_list_frame.winfo_children():
-            widget.destroy()
-            
-        filter_val = self.var_filter.get()
-        tasks_to_show = []
-        for i, task in enumerate(self.data['tasks']):
-            if filter_val == 'All': tasks_to_show.append((i, task))
-            elif filter_val == 'Completed' and task['completed']: tasks_to_show.append((i, task))
-            elif filter_val == 'Pending' and not task['completed']: tasks_to_show.append((i, task))
-            
-        if self.var_sort.get() == 'Priority':
-            priority_map = {'High': 3, 'Medium': 2, 'Low': 1}
-            tasks_to_show.sort(key=lambda x: priority_map.get(x[1].get('priority', 'Medium'), 1), reverse=True)
-
-        for i, task in tasks_to_show:
-            f = tk.Frame(self.task_list_frame, bg=self.theme_mgr.colors['card'], pady=8, padx=8)
-            f.pack(fill='x', pady=5)
-            f.config(relief='raised', bd=1)
-            self.register_widget(f, 'card')
-            
-            status_char = "✓" if task['completed'] else "○"
-            btn_check = tk.Button(f, text=status_char, command=lambda idx=i: self.toggle_task(idx), 
-                                  font=("Segoe UI", 16, "bold"), borderwidth=0, bg=self.theme_mgr.colors['card'], 
-                                  fg=self.theme_mgr.colors['primary'], activebackground=self.theme_mgr.colors['card'],
-                                  activeforeground=self.theme_mgr.colors['secondary'], relief='flat', padx=2, pady=2)
-            btn_check.pack(side='left', padx=8)
-            self.register_widget(btn_check, 'card_btn_primary')
-
-            lbl = tk.Label(f, text=task['text'], font=("Segoe UI", 11), bg=self.theme_mgr.colors['card'], fg=self.theme_mgr.colors['text'], justify='left')
-            lbl.pack(side='left', fill='x', expand=True, padx=5)
-            self.register_widget(lbl, 'card_label')
-            
-            if task['completed']:
-                lbl.config(fg=self.theme_mgr.colors['text_dim'], font=("Segoe UI", 11, "overstrike"))
-
-            btn_del = tk.Button(f, text="✕", command=lambda idx=i: self.delete_task(idx),
-                                font=("Segoe UI", 11, "bold"), borderwidth=0, bg=self.theme_mgr.colors['card'], 
-                                fg=self.theme_mgr.colors['danger'], activebackground=self.theme_mgr.colors['card'],
-                                activeforeground='#ef4444', relief='flat', padx=4, pady=2)
-            btn_del.pack(side='right', padx=5)
-            self.register_widget(btn_del, 'card_btn_danger')
-
-    def toggle_task(self, index):
-        self.data['tasks'][index]['completed'] = not self.data['tasks'][index]['completed']
-        if self.data['tasks'][index]['completed']:
-            self.add_xp(10)
-        self.save()
-        self.render_tasks()
-        self.apply_all_themes()
-
-    def delete_task(self, index):
-        del self.data['tasks'][index]
-        self.save()
-        self.render_tasks()
-
-    def update_timer_display(self):
-        mins = self.timer_seconds // 60
-        secs = self.timer_seconds % 60
-        self.lbl_timer.config(text=f"{mins:02d}:{secs:02d}")
-
-    def reset_timer(self):
-        self.timer_running = False
-        self.timer_seconds = 25 * 60
-        self.update_timer_display()
-        self.btn_start.config(text="START FOCUS", style='Primary.TButton')
-
-    def update_clock(self):
-        self.clock_canvas.delete("all")
-        c = self.theme_mgr.colors
-        w, h = 220, 220
-        cx, cy = w/2, h/2
-        
-        self.clock_canvas.create_oval(10, 10, 210, 210, outline=c['primary'], width=4)
-        
-        now = datetime.now()
-        time_str = now.strftime("%H:%M")
-        sec_str = now.strftime("%S")
-        self.clock_canvas.create_text(cx, cy-10, text=time_str, fill=c['text'], font=("Segoe UI", 40, "bold"))
-        self.clock_canvas.create_text(cx, cy+30, text=sec_str, fill=c['secondary'], font=("Segoe UI", 20))
-        
-        self.root.after(1000, self.update_clock)
-
-    def change_theme(self, mode):
-        self.data['current_theme'] = mode
-        self.theme_mgr.switch_theme(mode)
-        self.reapply_all_themes()
-        self.save()
-
-    def register_widget(self, widget, role):
-        self.widgets_to_theme.append((widget, role))
-
-    def reapply_all_themes(self):
-        c = self.theme_mgr.colors
-        for widget, role in self.widgets_to_theme:
-            try:
-                if role == 'canvas': widget.configure(bg=c['card'])
-                elif role == 'card': widget.configure(bg=c['card'])
-                elif role == 'card_label': widget.configure(bg=c['card'], fg=c['text'])
-                elif role == 'card_btn_primary': widget.configure(bg=c['card'], fg=c['primary'])
-                elif role == 'card_btn_danger': widget.configure(bg=c['card'], fg=c['danger'])
-            except: pass
-        self.render_tasks()
-
-    def save(self):
-        self.data['current_filter'] = self.var_filter.get()
-        self.data['current_sort_order'] = self.var_sort.get()
-        self.data_mgr.save_data(self.data)
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = ZenTaskChronos(root)
+import tkinter as tk
+from tkinter import ttk, messagebox, Menu
+import math
+import bisect
+import os
+import time
+import weakref
+import threading
+from datetime import datetime
+from collections import deque
+
+from zentask_core import ZenTaskCore, DataManager, DataLockedError, TaskStore, ImportCancelled, AudioEngine, Profiler, create_data_manager, current_streak, rollup_series
+
+JITTER_SAMPLES = 120
+PROGRESS_FPS = 10
+HEARTBEAT_MS = 100
+LOADER_POLL_MS = 20
+SYNC_INTERVAL = 1.0
+
+class ThemeManager:
+    def __init__(self, root, style_obj, initial_theme='dark'):
+        self.root = root
+        self.style = style_obj
+        self.current_theme = initial_theme
+        
+        self.themes = {
+            'dark': {
+                'bg': '#0f172a', 'card': '#1e293b', 'text': '#f1f5f9', 
+                'text_dim': '#94a3b8', 'primary': '#6366f1', 
+                'secondary': '#f59e0b', 'success': '#10b981', 'danger': '#ef4444',
+                'accent': '#818cf8'
+            },
+            'light': {
+                'bg': '#f8fafc', 'card': '#ffffff', 'text': '#1e293b', 
+                'text_dim': '#64748b', 'primary': '#4f46e5', 
+                'secondary': '#f97316', 'success': '#16a34a', 'danger': '#dc2626',
+                'accent': '#a5b4fc'
+            }
+        }
+        self.role_colors = {
+            'canvas': {'bg': 'card'},
+            'card': {'bg': 'card'},
+            'card_label': {'bg': 'card', 'fg': 'text'},
+            'card_label_dim': {'bg': 'card', 'fg': 'text_dim'},
+            'stat_value': {'bg': 'card', 'fg': 'primary'},
+            'card_btn_primary': {'bg': 'card', 'fg': 'primary', 'activebackground': 'card', 'activeforeground': 'secondary'},
+            'card_btn_danger': {'bg': 'card', 'fg': 'danger', 'activebackground': 'card'},
+        }
+        self.role_options = {
+            name: {role: {opt: colors[key] for opt, key in opts.items()} for role, opts in self.role_colors.items()}
+            for name, colors in self.themes.items()
+        }
+        self.colors = self.themes[self.current_theme]
+        self.apply_theme()
+
+    def switch_theme(self, theme_name):
+        if theme_name in self.themes:
+            self.current_theme = theme_name
+            self.apply_theme()
+            return True
+        return False
+
+    def apply_theme(self):
+        self.colors = self.themes[self.current_theme]
+        self.root.configure(bg=self.colors['bg'])
+        self.setup_styles()
+
+    def setup_styles(self):
+        self.style.theme_use('clam')
+        c = self.colors
+        
+        self.style.configure('TFrame', background=c['bg'])
+        self.style.configure('Card.TFrame', background=c['card'], relief='flat')
+        
+        self.style.configure('TLabel', background=c['bg'], foreground=c['text'], font=('Segoe UI', 11))
+        self.style.configure('Card.TLabel', background=c['card'], foreground=c['text'], font=('Segoe UI', 11))
+        self.style.configure('Header.TLabel', background=c['bg'], foreground=c['text'], font=('Segoe UI', 22, 'bold'))
+        self.style.configure('Stat.TLabel', background=c['card'], foreground=c['primary'], font=('Segoe UI', 24, 'bold'))
+        
+        self.style.configure('TButton', font=('Segoe UI', 11, 'bold'), borderwidth=0, background=c['card'], foreground=c['text'], focuscolor=c['bg'], padding=8)
+        self.style.map('TButton', background=[('active', c['text_dim']), ('pressed', c['text_dim'])], foreground=[('active', 'white')])
+        
+        self.style.configure('Primary.TButton', background=c['primary'], foreground='white', font=('Segoe UI', 12, 'bold'), borderwidth=0, padding=10)
+        self.style.map('Primary.TButton', background=[('active', c['accent']), ('pressed', c['secondary'])], foreground=[('active', 'white'), ('pressed', 'white')])
+
+        self.style.configure('Secondary.TButton', background=c['secondary'], foreground='white', font=('Segoe UI', 12, 'bold'), borderwidth=0, padding=10)
+        self.style.map('Secondary.TButton', background=[('active', c['primary']), ('pressed', c['accent'])])
+
+        self.style.configure('Danger.TButton', background=c['danger'], foreground='white', font=('Segoe UI', 10, 'bold'), borderwidth=0, padding=8)
+        self.style.map('Danger.TButton', background=[('active', '#dc2626'), ('pressed', '#991b1b')])
+
+        self.style.configure('TEntry', fieldbackground=c['card'], foreground=c['text'], insertcolor=c['primary'], borderwidth=1, relief='solid', padding=5)
+        self.style.configure('TSpinbox', fieldbackground=c['card'], foreground=c['text'], arrowcolor=c['text'], borderwidth=1, relief='solid')
+        self.style.configure('TCombobox', fieldbackground=c['card'], foreground=c['text'], selectbackground=c['primary'], borderwidth=1, relief='solid')
+        
+        self.style.configure('TNotebook', background=c['bg'], borderwidth=0)
+        self.style.configure('TNotebook.Tab', background=c['bg'], foreground=c['text_dim'], padding=[20, 10], font=('Segoe UI', 11, 'bold'))
+        self.style.map('TNotebook.Tab', background=[('selected', c['card'])], foreground=[('selected', c['primary'])])
+
+    def apply_to_widget(self, widget, role, state=None):
+        c = self.colors
+        try:
+            if role == 'root': widget.configure(bg=c['bg'])
+            elif role == 'canvas': widget.configure(bg=c['card'], highlightthickness=0)
+            elif isinstance(widget, tk.Label):
+                if role == 'card_label': widget.configure(bg=c['card'], fg=c['text'])
+                else: widget.configure(bg=c['bg'], fg=c['text'])
+            elif isinstance(widget, tk.Frame):
+                if role == 'card': widget.configure(bg=c['card'])
+                else: widget.configure(bg=c['bg'])
+            elif isinstance(widget, tk.Entry):
+                 widget.configure(bg=c['card'], fg=c['text'], insertbackground=c['text'])
+        except:
+            pass
+
+class ThemeRegistry:
+    def __init__(self, theme_mgr):
+        self.theme_mgr = theme_mgr
+        self.roles = {}
+        self.last_restyle = 0.0
+
+    def register(self, widget, role):
+        widgets = self.roles.setdefault(role, weakref.WeakSet())
+        if widget in widgets:
+            return
+        widgets.add(widget)
+        widget.bind('<Destroy>', lambda e: self.unregister(widget, role), add='+')
+
+    def unregister(self, widget, role):
+        widgets = self.roles.get(role)
+        if widgets is not None:
+            widgets.discard(widget)
+
+    def apply(self):
+        start = time.perf_counter()
+        options = self.theme_mgr.role_options[self.theme_mgr.current_theme]
+        for role, widgets in self.roles.items():
+            opts = options.get(role)
+            if not opts:
+                continue
+            for widget in list(widgets):
+                try:
+                    widget.configure(**opts)
+                except tk.TclError:
+                    widgets.discard(widget)
+        self.last_restyle = time.perf_counter() - start
+
+    def live_count(self):
+        return sum(len(widgets) for widgets in self.roles.values())
+
+    def report(self):
+        return {
+            'live': self.live_count(),
+            'by_role': {role: len(widgets) for role, widgets in self.roles.items()},
+            'last_restyle_ms': round(self.last_restyle * 1000, 3),
+        }
+
+class TaskListView:
+    ROW_HEIGHT = 58
+    ROW_GAP = 10
+    OVERSCAN = 4
+
+    def __init__(self, canvas, scrollbar, theme_mgr, on_toggle, on_delete, on_edit, register_widget):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.theme_mgr = theme_mgr
+        self.on_toggle = on_toggle
+        self.on_delete = on_delete
+        self.on_edit = on_edit
+        self.register_widget = register_widget
+        self.items = []
+        self.keys = []
+        self.rank = lambda task: 0
+        self.rows = []
+
+        self.canvas.configure(yscrollcommand=self.on_scroll, yscrollincrement=1, scrollregion=(0, 0, 0, 0))
+        self.canvas.bind('<Configure>', self.on_resize)
+        self.bind_wheel(self.canvas)
+
+    def bind_wheel(self, widget):
+        for seq in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            widget.bind(seq, self.on_wheel)
+
+    def on_wheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.canvas.yview_scroll(step * self.ROW_HEIGHT, 'units')
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.layout()
+
+    def on_resize(self, event):
+        for row in self.rows:
+            self.canvas.itemconfigure(row['window'], width=event.width)
+        needed = math.ceil(event.height / self.ROW_HEIGHT) + 1 + 2 * self.OVERSCAN
+        if needed > len(self.rows):
+            while len(self.rows) < needed:
+                self.rows.append(self.create_row(event.width))
+            # pool size changed, so every slot maps to a different position now
+            for row in self.rows:
+                row['pos'] = None
+        self.layout()
+
+    def create_row(self, width):
+        c = self.theme_mgr.colors
+        row = {'pos': None, 'shown': False}
+        f = tk.Frame(self.canvas, bg=c['card'], pady=8, padx=8, relief='raised', bd=1)
+        self.register_widget(f, 'card')
+
+        btn_check = tk.Button(f, text="○", command=lambda: self.on_toggle(self.items[row['pos']]),
+                              font=("Segoe UI", 16, "bold"), borderwidth=0, bg=c['card'],
+                              fg=c['primary'], activebackground=c['card'],
+                              activeforeground=c['secondary'], relief='flat', padx=2, pady=2)
+        btn_check.pack(side='left', padx=8)
+        self.register_widget(btn_check, 'card_btn_primary')
+
+        lbl = tk.Label(f, font=("Segoe UI", 11), bg=c['card'], fg=c['text'], justify='left', anchor='w')
+        lbl.pack(side='left', fill='x', expand=True, padx=5)
+        lbl.bind('<Double-Button-1>', lambda e: self.on_edit(self.items[row['pos']]))
+        self.register_widget(lbl, 'card_label')
+
+        btn_del = tk.Button(f, text="✕", command=lambda: self.on_delete(self.items[row['pos']]),
+                            font=("Segoe UI", 11, "bold"), borderwidth=0, bg=c['card'],
+                            fg=c['danger'], activebackground=c['card'],
+                            activeforeground='#ef4444', relief='flat', padx=4, pady=2)
+        btn_del.pack(side='right', padx=5)
+        self.register_widget(btn_del, 'card_btn_danger')
+
+        for w in (f, btn_check, lbl, btn_del):
+            self.bind_wheel(w)
+
+        row.update(frame=f, check=btn_check, label=lbl,
+                   window=self.canvas.create_window(0, 0, window=f, anchor='nw', width=width,
+                                                    height=self.ROW_HEIGHT - self.ROW_GAP, state='hidden'))
+        return row
+
+    def set_items(self, entries, rank=None):
+        # entries are (task id, task) pairs already in view order; rows are
+        # keyed by (rank, id) so single-task changes can be located with bisect
+        if rank is not None:
+            self.rank = rank
+        rank = self.rank
+        self.keys = [(rank(task), task_id) for task_id, task in entries]
+        self.items = [task for _, task in entries]
+        self.refresh()
+
+    def set_query(self, query):
+        # paged mode: the query pages rows in from storage, so there are no
+        # local keys and every mutation just re-reads the visible window
+        self.items = query
+        self.keys = None
+        self.refresh()
+
+    def refresh(self):
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.ROW_HEIGHT))
+        for row in self.rows:
+            row['pos'] = None
+        self.layout()
+
+    def position(self, task):
+        if self.keys is None:
+            return None
+        pos = bisect.bisect_left(self.keys, (self.rank(task), task['id']))
+        if pos < len(self.items) and self.items[pos] is task:
+            return pos
+        return None
+
+    def insert(self, task):
+        if self.keys is None:
+            self.refresh()
+            return
+        key = (self.rank(task), task['id'])
+        pos = bisect.bisect_left(self.keys, key)
+        if pos < len(self.items) and self.items[pos] is task:
+            # already drawn by a reload that merged it in
+            return
+        self.keys.insert(pos, key)
+        self.items.insert(pos, task)
+        self.shift_from(pos)
+
+    def remove(self, task):
+        if self.keys is None:
+            self.refresh()
+            return
+        pos = self.position(task)
+        if pos is None:
+            return
+        del self.keys[pos]
+        del self.items[pos]
+        self.shift_from(pos)
+
+    def update(self, task):
+        if self.keys is None:
+            self.refresh()
+            return
+        pos = self.position(task)
+        if pos is None:
+            return
+        row = self.rows[pos % len(self.rows)] if self.rows else None
+        if row is not None and row['pos'] == pos:
+            self.bind_row(row, pos)
+
+    def shift_from(self, pos):
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.ROW_HEIGHT))
+        for row in self.rows:
+            if row['pos'] is not None and row['pos'] >= pos:
+                row['pos'] = None
+        self.layout()
+
+    def layout(self):
+        if not self.rows:
+            return
+        top = max(0, int(self.canvas.canvasy(0)))
+        height = self.canvas.winfo_height()
+        first = max(0, top // self.ROW_HEIGHT - self.OVERSCAN)
+        last = min(len(self.items), (top + height) // self.ROW_HEIGHT + 1 + self.OVERSCAN, first + len(self.rows))
+
+        # a row cleared by refresh() or shift_from() may still be drawn with
+        # its old task, so anything not bound inside the window is hidden
+        for row in self.rows:
+            if row['pos'] is None or not first <= row['pos'] < last:
+                if row['shown']:
+                    self.canvas.itemconfigure(row['window'], state='hidden')
+                    row['shown'] = False
+                row['pos'] = None
+        for pos in range(first, last):
+            row = self.rows[pos % len(self.rows)]
+            if row['pos'] != pos:
+                self.bind_row(row, pos)
+
+    def bind_row(self, row, pos):
+        c = self.theme_mgr.colors
+        task = self.items[pos]
+        if task['completed']:
+            row['check'].config(text="✓")
+            row['label'].config(text=task['text'], fg=c['text_dim'], font=("Segoe UI", 11, "overstrike"))
+        else:
+            row['check'].config(text="○")
+            row['label'].config(text=task['text'], fg=c['text'], font=("Segoe UI", 11))
+        self.canvas.coords(row['window'], 0, pos * self.ROW_HEIGHT)
+        self.canvas.itemconfigure(row['window'], state='normal')
+        row['pos'] = pos
+        row['shown'] = True
+
+class ClockFace:
+    def __init__(self, canvas, theme_mgr, size=220, fps=PROGRESS_FPS):
+        self.canvas = canvas
+        self.theme_mgr = theme_mgr
+        self.fps = fps
+        self.shown = {}
+        c = theme_mgr.colors
+        cx = cy = size / 2
+        self.ring = canvas.create_oval(10, 10, size - 10, size - 10, outline=c['primary'], width=4)
+        self.arc = canvas.create_arc(10, 10, size - 10, size - 10, start=90, extent=0, style='arc',
+                                     outline=c['secondary'], width=6, state='hidden')
+        self.time_text = canvas.create_text(cx, cy - 10, text='', fill=c['text'], font=("Segoe UI", 40, "bold"))
+        self.sec_text = canvas.create_text(cx, cy + 30, text='', fill=c['secondary'], font=("Segoe UI", 20))
+
+    def set_item(self, item, **options):
+        # skip the Tk round trip when nothing visible would change
+        if self.shown.get(item) == options:
+            return
+        self.shown[item] = options
+        self.canvas.itemconfigure(item, **options)
+
+    def set_time(self, time_str, sec_str):
+        self.set_item(self.time_text, text=time_str)
+        self.set_item(self.sec_text, text=sec_str)
+
+    def set_progress(self, fraction):
+        extent = round(-360 * min(max(fraction, 0.0), 1.0), 1)
+        if extent == 0:
+            self.set_item(self.arc, state='hidden')
+        else:
+            self.set_item(self.arc, state='normal', extent=extent)
+
+    def recolor(self):
+        c = self.theme_mgr.colors
+        self.canvas.itemconfigure(self.ring, outline=c['primary'])
+        self.canvas.itemconfigure(self.arc, outline=c['secondary'])
+        self.canvas.itemconfigure(self.time_text, fill=c['text'])
+        self.canvas.itemconfigure(self.sec_text, fill=c['secondary'])
+
+class TickScheduler:
+    def __init__(self, root, clock=time.monotonic, wall=time.time):
+        self.root = root
+        self.clock = clock
+        self.wall = wall
+        self.listeners = []
+        self.boundaries = []
+        self.pending = None
+        self.expected = None
+        self.dispatching = False
+        self.jitter = deque(maxlen=JITTER_SAMPLES)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def add_boundary(self, source):
+        self.boundaries.append(source)
+
+    def start(self):
+        self.wake()
+
+    def wake(self):
+        # run a tick now, e.g. after a pause/resume, without counting it as jitter
+        self.expected = None
+        self.tick()
+
+    def tick(self):
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        now = self.clock()
+        if self.expected is not None:
+            self.jitter.append(now - self.expected)
+        # the next tick is armed before dispatch, so a listener that stalls or
+        # raises cannot stop the clock, and the stall shows up as jitter
+        self.expected = None
+        self.schedule()
+        if self.dispatching:
+            return
+        self.dispatching = True
+        try:
+            for callback in self.listeners:
+                callback(now)
+        finally:
+            self.dispatching = False
+            # listeners may have moved a boundary, e.g. by starting the timer
+            self.schedule()
+
+    def schedule(self):
+        now = self.clock()
+        if self.pending is not None and self.expected <= now:
+            # the armed tick is already late; let it fire and count the delay
+            return
+        next_at = now + (1.0 - self.wall() % 1.0)
+        for source in self.boundaries:
+            boundary = source(now)
+            if boundary is not None and now < boundary < next_at:
+                next_at = boundary
+        self.expected = next_at
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+        self.pending = self.root.after(max(1, math.ceil((next_at - now) * 1000)), self.tick)
+
+    def stop(self):
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+
+    def jitter_stats(self):
+        samples = sorted(self.jitter)
+        if not samples:
+            return {'samples': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'samples': len(samples),
+            'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+            'p95_ms': round(samples[int(0.95 * (len(samples) - 1))] * 1000, 3),
+            'max_ms': round(samples[-1] * 1000, 3),
+        }
+
+class DiagnosticsPanel:
+    REFRESH_MS = 1000
+
+    def __init__(self, app):
+        self.app = app
+        self.after_id = None
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Diagnostics")
+        self.window.geometry("620x460")
+        self.window.bind('<Destroy>', self.on_destroy)
+
+        frame = ttk.Frame(self.window, padding=12)
+        frame.pack(fill='both', expand=True)
+        self.tree = ttk.Treeview(frame, columns=('count', 'mean', 'p95', 'max'), show='tree headings', height=12)
+        self.tree.heading('#0', text='Hot path')
+        self.tree.column('#0', width=200)
+        for col, title in (('count', 'Calls'), ('mean', 'Mean ms'), ('p95', 'p95 ms'), ('max', 'Max ms')):
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=90, anchor='e')
+        self.tree.pack(fill='both', expand=True)
+
+        self.lbl_extra = ttk.Label(frame, justify='left', font=("Segoe UI", 10))
+        self.lbl_extra.pack(fill='x', pady=10)
+
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill='x')
+        ttk.Button(btn_frame, text="Export JSON", command=self.export_json).pack(side='left', padx=(0, 8))
+        ttk.Button(btn_frame, text="Export CSV", command=self.export_csv).pack(side='left', padx=(0, 8))
+        ttk.Button(btn_frame, text="Reset", command=self.reset).pack(side='right')
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for name, stats in self.app.profiler.snapshot().items():
+            self.tree.insert('', 'end', text=name, values=(stats['count'], stats['mean_ms'], stats['p95_ms'], stats['max_ms']))
+        extra = self.app.diagnostics_extra()
+        jitter = extra['timer_jitter']
+        themes = extra['theme_registry']
+        self.lbl_extra.config(text=(
+            f"Profiling: {'on' if extra['profiling'] else 'off (enable it from the Help menu)'}\n"
+            f"Timer jitter: mean {jitter['mean_ms']} ms • p95 {jitter['p95_ms']} ms • max {jitter['max_ms']} ms\n"
+            f"Themed widgets: {themes['live']} • last restyle {themes['last_restyle_ms']} ms\n"
+            f"Startup: first paint {extra['startup']['first_paint_ms']} ms • data loaded {extra['startup']['data_loaded_ms']} ms\n"
+            f"Dropped sound cues: {extra['audio_dropped']}\n"
+            f"Local API: {extra['api'] or 'off'}"))
+        self.after_id = self.window.after(self.REFRESH_MS, self.refresh)
+
+    def export_json(self):
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension='.json', filetypes=[('JSON', '*.json')])
+        if path:
+            self.app.profiler.export_json(path, self.app.diagnostics_extra())
+
+    def export_csv(self):
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension='.csv', filetypes=[('CSV', '*.csv')])
+        if path:
+            self.app.profiler.export_csv(path)
+
+    def reset(self):
+        self.app.profiler.reset()
+        self.app.scheduler.jitter.clear()
+
+    def on_destroy(self, event):
+        if event.widget is self.window and self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+            self.app.diagnostics = None
+
+class ImportDialog:
+    def __init__(self, app, path):
+        self.app = app
+        self.path = path
+        self.cancel = threading.Event()
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Import Tasks")
+        self.window.transient(app.root)
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel.set)
+
+        frame = ttk.Frame(self.window, padding=16)
+        frame.pack(fill='both', expand=True)
+        self.lbl_status = ttk.Label(frame, text=f"Reading {os.path.basename(path)}…", font=("Segoe UI", 10))
+        self.lbl_status.pack(anchor='w')
+        self.bar = ttk.Progressbar(frame, maximum=max(os.path.getsize(path), 1), length=320)
+        self.bar.pack(fill='x', pady=12)
+        ttk.Button(frame, text="Cancel", command=self.cancel.set).pack(side='right')
+        self.window.grab_set()
+
+    def run(self):
+        try:
+            with open(self.path, 'rb') as f:
+                return self.app.core.import_tasks(f, TaskStore.format_for(self.path), self.on_progress, self.cancel)
+        finally:
+            self.window.grab_release()
+            self.window.destroy()
+
+    def on_progress(self, rows, pos):
+        # the import runs on the Tk thread (SQLite connections are bound to it),
+        # so pump events here to repaint and let Cancel through
+        self.bar['value'] = pos
+        self.lbl_status.config(text=f"{rows} rows read")
+        self.window.update()
+
+class ZenTaskChronos:
+    PROFILED = ('render_tasks', 'save', 'reapply_all_themes', 'update_clock', 'play_sound')
+
+    def __init__(self, root):
+        self.started = time.perf_counter()
+        self.startup = {'first_paint_ms': None, 'data_loaded_ms': None}
+        self.root = root
+        self.root.title("ZenTask Chronos")
+        self.root.geometry("600x800")
+        
+        icon_path = os.path.join(os.path.dirname(__file__), 'icon.ico')
+        if os.path.exists(icon_path):
+            try:
+                self.root.iconbitmap(icon_path)
+            except Exception as e:
+                print(f"Icon load error: {e}")
+        
+        self.profiler = Profiler.from_env()
+        self.diagnostics = None
+        self.heartbeat = None
+        self.data_mgr = create_data_manager()
+        if self.profiler.enabled:
+            self.profiler.instrument(self.data_mgr, ('load_data', 'save_data'), 'data.')
+        # the data file is parsed on a loader thread after the first paint;
+        # until it lands the Timer tab runs on defaults and the other tabs wait
+        self.core = None
+        self.timer = None
+        self.data = DataManager.default_data()
+        self.task_view = None
+        self.stats_canvas = None
+        self.built_tabs = set()
+        self.audio = AudioEngine()
+        
+        self.theme_mgr = ThemeManager(root, ttk.Style(), self.data['current_theme'])
+        self.theme_registry = ThemeRegistry(self.theme_mgr)
+
+        self.var_filter = tk.StringVar(value=self.data['current_filter'])
+        self.var_sort = tk.StringVar(value=self.data['current_sort_order'])
+        self.var_search = tk.StringVar()
+        self.var_focus_time = tk.IntVar(value=self.data['custom_timer_settings']['focus_time'])
+        self.var_short_break = tk.IntVar(value=self.data['custom_timer_settings']['short_break_time'])
+        self.var_long_break = tk.IntVar(value=self.data['custom_timer_settings']['long_break_time'])
+        self.var_stats_period = tk.StringVar(value='Daily')
+        self.var_profiling = tk.BooleanVar(value=self.profiler.enabled)
+        self.var_api = tk.BooleanVar(value=False)
+        self.api = None
+
+        self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.scheduler = TickScheduler(root)
+        self.scheduler.add_boundary(self.progress_boundary)
+        self.scheduler.add_listener(self.on_tick)
+        self.scheduler.start()
+        if self.profiler.enabled:
+            self.set_profiling(True)
+        # the clock canvas is drawn once its window is mapped and exposed
+        self.clock_canvas.bind('<Expose>', self.on_first_expose)
+
+    def on_first_expose(self, event):
+        # Expose queues the canvas redisplay as an idle handler, so an idle
+        # callback queued now runs right after the first paint
+        self.clock_canvas.unbind('<Expose>')
+        self.root.after_idle(self.on_first_paint)
+
+    def on_first_paint(self):
+        elapsed = time.perf_counter() - self.started
+        self.startup['first_paint_ms'] = round(elapsed * 1000, 1)
+        self.profiler.record('startup.first_paint', elapsed)
+        self.load_result = None
+        self.loader = threading.Thread(target=self.run_loader, name='zentask-loader', daemon=True)
+        self.loader.start()
+        self.root.after(LOADER_POLL_MS, self.poll_loader)
+
+    def run_loader(self):
+        try:
+            if self.data_mgr.paged:
+                # SQLite connections are bound to the thread that opens them, so
+                # only the migration runs here and the core is built on the Tk thread
+                self.data_mgr.prepare()
+            else:
+                self.load_result = ZenTaskCore(self.data_mgr)
+        except Exception as e:
+            self.load_result = e
+
+    def poll_loader(self):
+        if self.loader.is_alive():
+            self.root.after(LOADER_POLL_MS, self.poll_loader)
+            return
+        if isinstance(self.load_result, DataLockedError):
+            messagebox.showerror("ZenTask Chronos", str(self.load_result))
+            self.root.destroy()
+            return
+        if isinstance(self.load_result, Exception):
+            raise self.load_result
+        self.on_data_loaded(self.load_result or ZenTaskCore(self.data_mgr))
+
+    def on_data_loaded(self, core):
+        self.core = core
+        self.core.subscribe(self.on_core_event)
+        self.data = self.core.data
+        self.timer = self.core.timer
+        self.var_filter.set(self.data['current_filter'])
+        self.var_sort.set(self.data['current_sort_order'])
+        self.var_focus_time.set(self.data['custom_timer_settings']['focus_time'])
+        self.var_short_break.set(self.data['custom_timer_settings']['short_break_time'])
+        self.var_long_break.set(self.data['custom_timer_settings']['long_break_time'])
+        self.lbl_level.config(text=f"⭐ Lvl {self.data['level']} • {self.data['xp']} XP")
+        if self.data['current_theme'] != self.theme_mgr.current_theme:
+            self.theme_mgr.switch_theme(self.data['current_theme'])
+            self.reapply_all_themes()
+        self.scheduler.add_boundary(self.timer.countdown.next_boundary)
+        self.last_sync = time.monotonic()
+        self.scheduler.add_listener(self.on_sync_tick)
+        for button in self.timer_buttons:
+            button.state(['!disabled'])
+        self.update_timer_display()
+        self.build_tab(self.root.nametowidget(self.notebook.select()))
+
+        if os.environ.get('ZENTASK_API'):
+            self.set_api(True)
+
+        elapsed = time.perf_counter() - self.started
+        self.startup['data_loaded_ms'] = round(elapsed * 1000, 1)
+        self.profiler.record('startup.data_loaded', elapsed)
+        self.scheduler.wake()
+
+    def play_sound(self, sound_type='notification'):
+        self.audio.play(sound_type)
+
+    def setup_ui(self):
+        menubar = Menu(self.root)
+        self.root.config(menu=menubar)
+        view_menu = Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Theme", menu=view_menu)
+        view_menu.add_command(label="Dark Mode", command=lambda: self.change_theme('dark'))
+        view_menu.add_command(label="Light Mode", command=lambda: self.change_theme('light'))
+        tasks_menu = Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Tasks", menu=tasks_menu)
+        tasks_menu.add_command(label="Import…", command=self.import_tasks)
+        tasks_menu.add_command(label="Export…", command=self.export_tasks)
+        help_menu = Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Help", menu=help_menu)
+        help_menu.add_checkbutton(label="Profiling", variable=self.var_profiling,
+                                  command=lambda: self.set_profiling(self.var_profiling.get()))
+        help_menu.add_checkbutton(label="Local API Server", variable=self.var_api,
+                                  command=lambda: self.set_api(self.var_api.get()))
+        help_menu.add_command(label="Diagnostics…", command=self.open_diagnostics)
+        help_menu.add_command(label="About", command=lambda: messagebox.showinfo("About", "ZenTask Chronos v1.0"))
+
+        self.main_container = ttk.Frame(self.root, padding=20)
+        self.main_container.pack(fill='both', expand=True)
+
+        header_frame = ttk.Frame(self.main_container)
+        header_frame.pack(fill='x', pady=(0, 25))
+        
+        lbl_title = ttk.Label(header_frame, text="🎯 ZenTask Chronos", style='Header.TLabel')
+        lbl_title.pack(side='left')
+        
+        self.lbl_level = ttk.Label(header_frame, text=f"⭐ Lvl {self.data['level']} • {self.data['xp']} XP", style='Card.TLabel', font=("Segoe UI", 13, "bold"))
+        self.lbl_level.pack(side='right', pady=10)
+
+        self.notebook = ttk.Notebook(self.main_container)
+        self.notebook.pack(fill='both', expand=True)
+        
+        self.tab_timer = ttk.Frame(self.notebook, style='Card.TFrame', padding=20)
+        self.tab_tasks = ttk.Frame(self.notebook, style='Card.TFrame', padding=20)
+        self.tab_stats = ttk.Frame(self.notebook, style='Card.TFrame', padding=20)
+        
+        self.notebook.add(self.tab_timer, text=' Timer ')
+        self.notebook.add(self.tab_tasks, text=' Tasks ')
+        self.notebook.add(self.tab_stats, text=' Stats ')
+
+        self.setup_timer_tab()
+        # Tasks and Stats are built the first time they are shown
+        self.tab_builders = {self.tab_tasks: self.setup_tasks_tab, self.tab_stats: self.setup_stats_tab}
+        self.tab_placeholders = {}
+        for tab in self.tab_builders:
+            self.tab_placeholders[tab] = ttk.Label(tab, text="Loading…", style='Card.TLabel', font=("Segoe UI", 12))
+            self.tab_placeholders[tab].pack(pady=40)
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.build_tab(self.root.nametowidget(self.notebook.select())))
+
+    def build_tab(self, tab):
+        if self.core is None or tab in self.built_tabs or tab not in self.tab_builders:
+            return
+        self.built_tabs.add(tab)
+        self.tab_placeholders.pop(tab).destroy()
+        self.tab_builders[tab]()
+
+    def setup_timer_tab(self):
+        self.clock_canvas = tk.Canvas(self.tab_timer, width=220, height=220, highlightthickness=0)
+        self.clock_canvas.pack(pady=(10, 20))
+        self.theme_mgr.apply_to_widget(self.clock_canvas, 'canvas')
+        self.register_widget(self.clock_canvas, 'canvas')
+        self.clock_face = ClockFace(self.clock_canvas, self.theme_mgr)
+
+        self.lbl_timer = ttk.Label(self.tab_timer, text="25:00", font=("Segoe UI", 64, "bold"), style='Card.TLabel')
+        self.lbl_timer.pack(pady=20)
+
+        btn_frame = ttk.Frame(self.tab_timer, style='Card.TFrame')
+        btn_frame.pack(pady=25)
+
+        self.btn_start = ttk.Button(btn_frame, text="▶ START FOCUS", command=self.toggle_timer, style='Primary.TButton', width=18)
+        self.btn_start.pack(side='left', padx=12)
+
+        btn_reset = ttk.Button(btn_frame, text="↻ RESET", command=self.reset_timer, style='TButton', width=12)
+        btn_reset.pack(side='left', padx=12)
+        self.timer_buttons = [self.btn_start, btn_reset]
+        
+        mode_frame = ttk.Frame(self.tab_timer, style='Card.TFrame')
+        mode_frame.pack(pady=20)
+        for m, t in [("⏱ Focus", 25), ("☕ Short Break", 5), ("🌙 Long Break", 15)]:
+            btn_mode = ttk.Button(mode_frame, text=m, style='TButton', command=lambda mod=m.split()[0], tim=t: self.set_mode(mod, tim))
+            btn_mode.pack(side='left', padx=8)
+            self.timer_buttons.append(btn_mode)
+        # enabled once the data (and with it the timer state) has loaded
+        for button in self.timer_buttons:
+            button.state(['disabled'])
+
+    def setup_tasks_tab(self):
+        input_frame = ttk.Frame(self.tab_tasks, style='Card.TFrame')
+        input_frame.pack(fill='x', pady=(0, 20))
+        
+        self.entry_task = ttk.Entry(input_frame, font=("Segoe UI", 12))
+        self.entry_task.pack(side='left', fill='x', expand=True, padx=(0, 12))
+        self.entry_task.bind('<Return>', lambda e: self.add_task())
+        
+        btn_add = ttk.Button(input_frame, text="➕ ADD", command=self.add_task, style='Primary.TButton', width=8)
+        btn_add.pack(side='right')
+
+        filter_frame = ttk.Frame(self.tab_tasks, style='Card.TFrame')
+        filter_frame.pack(fill='x', pady=(0, 15))
+        
+        ttk.Label(filter_frame, text="Filter:", style='Card.TLabel', font=("Segoe UI", 11, "bold")).pack(side='left', padx=(0, 8))
+        cb_filter = ttk.Combobox(filter_frame, textvariable=self.var_filter, values=['All', 'Completed', 'Pending'], state='readonly', width=12)
+        cb_filter.pack(side='left', padx=(0, 20))
+        cb_filter.bind('<<ComboboxSelected>>', lambda e: self.render_tasks())
+        
+        ttk.Label(filter_frame, text="Sort:", style='Card.TLabel', font=("Segoe UI", 11, "bold")).pack(side='left', padx=(0, 8))
+        cb_sort = ttk.Combobox(filter_frame, textvariable=self.var_sort, values=['None', 'Priority'], state='readonly', width=12)
+        cb_sort.pack(side='left', padx=(0, 20))
+        cb_sort.bind('<<ComboboxSelected>>', lambda e: self.render_tasks())
+
+        ttk.Label(filter_frame, text="Search:", style='Card.TLabel', font=("Segoe UI", 11, "bold")).pack(side='left', padx=(0, 8))
+        ttk.Entry(filter_frame, textvariable=self.var_search, font=("Segoe UI", 11)).pack(side='left', fill='x', expand=True)
+        self.var_search.trace_add('write', lambda *args: self.render_tasks())
+
+        self.canvas_tasks = tk.Canvas(self.tab_tasks, highlightthickness=0)
+        self.scrollbar_tasks = ttk.Scrollbar(self.tab_tasks, orient="vertical", command=self.canvas_tasks.yview)
+        
+        self.canvas_tasks.pack(side='left', fill='both', expand=True)
+        self.scrollbar_tasks.pack(side='right', fill='y')
+        
+        self.task_view = TaskListView(self.canvas_tasks, self.scrollbar_tasks, self.theme_mgr,
+                                      self.toggle_task, self.delete_task, self.edit_task, self.register_widget)
+        self.theme_mgr.apply_to_widget(self.canvas_tasks, 'canvas')
+        self.register_widget(self.canvas_tasks, 'canvas')
+        
+        self.render_tasks()
+
+    def setup_stats_tab(self):
+        stats_container = ttk.Frame(self.tab_stats, style='Card.TFrame')
+        stats_container.pack(fill='both', expand=True)
+        
+        def create_card(parent, title, value_var):
+            f = tk.Frame(parent, bg=self.theme_mgr.colors['card'], bd=2, relief='raised')
+            f.pack(fill='x', pady=15, padx=10, ipadx=15, ipady=15)
+            self.register_widget(f, 'card')
+            
+            tk.Label(f, text=title, font=("Segoe UI", 11, "bold"), fg=self.theme_mgr.colors['text_dim'], bg=self.theme_mgr.colors['card']).pack(anchor='w', pady=(0, 8))
+            l = tk.Label(f, textvariable=value_var, font=("Segoe UI", 32, "bold"), fg=self.theme_mgr.colors['primary'], bg=self.theme_mgr.colors['card'])
+            l.pack(anchor='w')
+            self.register_widget(f.winfo_children()[0], 'card_label_dim')
+            self.register_widget(l, 'stat_value')
+            return f
+
+        self.var_sessions = tk.StringVar(value=str(self.data['completed_focus_sessions']))
+        self.var_time = tk.StringVar(value=f"{self.data['total_focus_time']} m")
+        self.var_streak = tk.StringVar()
+        
+        create_card(stats_container, "Total Sessions Completed", self.var_sessions)
+        create_card(stats_container, "Total Focus Time", self.var_time)
+        create_card(stats_container, "Focus Streak", self.var_streak)
+
+        chart_frame = tk.Frame(stats_container, bg=self.theme_mgr.colors['card'], bd=2, relief='raised')
+        chart_frame.pack(fill='both', expand=True, pady=15, padx=10, ipadx=15, ipady=10)
+        self.register_widget(chart_frame, 'card')
+
+        chart_header = tk.Frame(chart_frame, bg=self.theme_mgr.colors['card'])
+        chart_header.pack(fill='x')
+        self.register_widget(chart_header, 'card')
+        lbl_chart = tk.Label(chart_header, text="Focus Minutes", font=("Segoe UI", 11, "bold"), fg=self.theme_mgr.colors['text_dim'], bg=self.theme_mgr.colors['card'])
+        lbl_chart.pack(side='left')
+        self.register_widget(lbl_chart, 'card_label_dim')
+        cb_period = ttk.Combobox(chart_header, textvariable=self.var_stats_period, values=['Daily', 'Weekly', 'Monthly'], state='readonly', width=10)
+        cb_period.pack(side='right')
+        cb_period.bind('<<ComboboxSelected>>', lambda e: self.render_stats_chart())
+
+        self.stats_canvas = tk.Canvas(chart_frame, height=150, highlightthickness=0)
+        self.stats_canvas.pack(fill='both', expand=True, pady=(8, 0))
+        self.stats_canvas.bind('<Configure>', lambda e: self.render_stats_chart())
+        self.theme_mgr.apply_to_widget(self.stats_canvas, 'canvas')
+        self.register_widget(self.stats_canvas, 'canvas')
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        if self.stats_canvas is None:
+            return
+        rollups = self.data['rollups']
+        self.var_sessions.set(str(self.data['completed_focus_sessions']))
+        self.var_time.set(f"{self.data['total_focus_time']} m")
+        self.var_streak.set(f"{current_streak(rollups)} days (best {rollups['streak']['best']})")
+        self.render_stats_chart()
+
+    def render_stats_chart(self):
+        canvas = self.stats_canvas
+        if canvas is None:
+            return
+        canvas.delete('chart')
+        c = self.theme_mgr.colors
+        period = self.var_stats_period.get().lower()
+        count = {'daily': 7, 'weekly': 8, 'monthly': 6}[period]
+        label_fmt = {'daily': '%a', 'weekly': '%d %b', 'monthly': '%b'}[period]
+        series = rollup_series(self.data['rollups'], period, count)
+
+        w, h = max(canvas.winfo_width(), 200), max(canvas.winfo_height(), 120)
+        top, bottom = 18, h - 20
+        peak = max(max(bucket['minutes'] for _, bucket in series), 1)
+        slot = w / count
+        for i, (day, bucket) in enumerate(series):
+            x0, x1 = i * slot + slot * 0.2, (i + 1) * slot - slot * 0.2
+            y0 = bottom - (bottom - top) * bucket['minutes'] / peak
+            canvas.create_rectangle(x0, y0, x1, bottom, fill=c['primary'], outline='', tags='chart')
+            canvas.create_text((x0 + x1) / 2, y0 - 8, text=str(bucket['minutes']), fill=c['text'], font=("Segoe UI", 8), tags='chart')
+            canvas.create_text((x0 + x1) / 2, bottom + 10, text=day.strftime(label_fmt), fill=c['text_dim'], font=("Segoe UI", 8), tags='chart')
+
+   
+    def set_mode(self, mode, minutes):
+        mode_map = {'⏱': 'Focus', '☕': 'Short Break', '🌙': 'Long Break'}
+        self.timer.set_mode(mode_map.get(mode, mode), minutes)
+        self.update_timer_display()
+        self.clock_face.set_progress(0.0)
+        self.btn_start.config(text="START FOCUS")
+
+    def toggle_timer(self):
+        if self.timer.running:
+            self.timer.pause()
+            self.btn_start.config(text="▶ RESUME", style='Primary.TButton')
+        elif self.timer.start():
+            self.btn_start.config(text="⏸ PAUSE", style='Secondary.TButton')
+        self.scheduler.wake()
+
+    def progress_boundary(self, now):
+        if self.timer is None or not self.timer.running:
+            return None
+        return now + 1.0 / self.clock_face.fps
+
+    def on_tick(self, now):
+        self.update_clock()
+        if self.core is None:
+            return
+        self.clock_face.set_progress(self.timer.countdown.progress(now))
+        seconds_left = self.timer.seconds_left
+        self.core.tick(now)
+        if self.timer.seconds_left != seconds_left:
+            self.update_timer_display()
+
+    def on_sync_tick(self, now):
+        # another window or the CLI may share the data file
+        if now - self.last_sync >= SYNC_INTERVAL:
+            self.last_sync = now
+            self.core.sync()
+
+    def notify(self, title, message):
+        # core events arrive inside a tick; the modal dialog opens after it returns
+        self.root.after_idle(lambda: messagebox.showinfo(title, message))
+
+    def on_core_event(self, kind, info):
+        if kind.startswith('task_') and self.task_view is None:
+            return
+        if kind == 'event':
+            self.refresh_stats()
+        elif kind == 'xp':
+            self.lbl_level.config(text=f"⭐ Lvl {info['level']} • {info['xp']} XP")
+        elif kind == 'level_up':
+            self.play_sound('success')
+            self.notify("⭐ Level Up!", f"You reached Level {info['level']}! ⭐")
+        elif kind == 'period_finished':
+            self.update_timer_display()
+            self.btn_start.config(text="▶ START FOCUS", style='Primary.TButton')
+            self.play_sound('success')
+            if info['mode'] != 'Focus':
+                self.play_sound('notification')
+                self.notify("ZenTask Chronos", "☕ Break Over! Time to focus.")
+        elif kind == 'session_complete':
+            self.play_sound('success')
+            self.notify("🎉 Session Complete!", "Session Complete! 🎉 +50 XP")
+        elif kind == 'task_added':
+            if self.task_matches_filter(info['task']):
+                self.task_view.insert(info['task'])
+        elif kind == 'task_updated':
+            if not self.task_matches_filter(info['task']):
+                self.task_view.remove(info['task'])
+            elif self.task_view.position(info['task']) is None:
+                self.task_view.insert(info['task'])
+            else:
+                self.task_view.update(info['task'])
+        elif kind == 'task_deleted':
+            self.task_view.remove(info['task'])
+        elif kind in ('tasks_imported', 'tasks_reloaded'):
+            if self.task_view is not None:
+                self.render_tasks()
+        elif kind == 'synced':
+            self.lbl_level.config(text=f"⭐ Lvl {self.data['level']} • {self.data['xp']} XP")
+            self.refresh_stats()
+            if 'current_theme' in info['keys'] and self.data['current_theme'] != self.theme_mgr.current_theme:
+                self.theme_mgr.switch_theme(self.data['current_theme'])
+                self.reapply_all_themes()
+
+    def add_task(self):
+        if self.core.add_task(self.entry_task.get()):
+            self.entry_task.delete(0, 'end')
+            self.play_sound('notification')
+
+    def task_matches_filter(self, task):
+        return self.core.tasks.matches_view(task, self.var_filter.get(), self.var_search.get())
+
+    def render_tasks(self):
+        self.data['current_filter'] = self.var_filter.get()
+        self.data['current_sort_order'] = self.var_sort.get()
+        if self.data_mgr.paged:
+            self.task_view.set_query(self.core.tasks.query(self.var_filter.get(), self.var_sort.get(), self.var_search.get()))
+            return
+        self.task_view.set_items(self.core.tasks.entries(self.var_filter.get(), self.var_search.get(), self.var_sort.get()),
+                                 TaskStore.rank(self.var_sort.get()))
+
+    def toggle_task(self, task):
+        self.core.toggle_task(task)
+
+    def import_tasks(self):
+        if self.core is None:
+            return
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(parent=self.root, title="Import Tasks",
+                                          filetypes=[('CSV or JSON Lines', '*.csv *.jsonl *.ndjson'), ('All files', '*')])
+        if not path:
+            return
+        try:
+            report = ImportDialog(self, path).run()
+        except ImportCancelled:
+            messagebox.showinfo("Import Tasks", "Import cancelled, nothing was added.")
+            return
+        except OSError as e:
+            messagebox.showerror("Import Tasks", str(e))
+            return
+        lines = [f"Imported {report['imported']} tasks."]
+        if report['rejected']:
+            lines.append(f"Rejected {report['rejected']} rows:")
+            lines.extend(report['errors'][:10])
+        messagebox.showinfo("Import Tasks", "\n".join(lines))
+
+    def export_tasks(self):
+        if self.core is None:
+            return
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=self.root, title="Export Tasks", defaultextension='.csv',
+                                            filetypes=[('CSV', '*.csv'), ('JSON Lines', '*.jsonl')])
+        if not path:
+            return
+        fmt = TaskStore.format_for(path)
+        try:
+            with open(path, 'w', newline='' if fmt == 'csv' else None, encoding='utf-8') as f:
+                count = self.core.export_tasks(f, fmt)
+        except OSError as e:
+            messagebox.showerror("Export Tasks", str(e))
+            return
+        messagebox.showinfo("Export Tasks", f"Exported {count} tasks.")
+
+    def edit_task(self, task):
+        from tkinter import simpledialog
+        text = simpledialog.askstring("Edit Task", "Task:", initialvalue=task['text'], parent=self.root)
+        if text is not None:
+            self.core.edit_task(task, text)
+
+    def delete_task(self, task):
+        self.core.delete_task(task)
+
+    def update_timer_display(self):
+        mins = self.timer.seconds_left // 60
+        secs = self.timer.seconds_left % 60
+        self.lbl_timer.config(text=f"{mins:02d}:{secs:02d}")
+
+    def reset_timer(self):
+        self.timer.reset(25 * 60)
+        self.update_timer_display()
+        self.clock_face.set_progress(0.0)
+        self.btn_start.config(text="START FOCUS", style='Primary.TButton')
+
+    def update_clock(self):
+        now = datetime.now()
+        self.clock_face.set_time(now.strftime("%H:%M"), now.strftime("%S"))
+
+    def change_theme(self, mode):
+        self.data['current_theme'] = mode
+        self.theme_mgr.switch_theme(mode)
+        self.reapply_all_themes()
+        self.save()
+
+    def register_widget(self, widget, role):
+        self.theme_registry.register(widget, role)
+
+    def reapply_all_themes(self):
+        self.theme_registry.apply()
+        self.clock_face.recolor()
+        if self.task_view is not None:
+            self.task_view.refresh()
+        self.render_stats_chart()
+
+    def save(self):
+        if self.core is None:
+            return
+        self.data['current_filter'] = self.var_filter.get()
+        self.data['current_sort_order'] = self.var_sort.get()
+        self.core.save()
+
+    def set_profiling(self, enabled):
+        self.profiler.enabled = enabled
+        if self.heartbeat is not None:
+            self.root.after_cancel(self.heartbeat)
+            self.heartbeat = None
+        if enabled:
+            self.profiler.instrument(self, self.PROFILED)
+            self.profiler.instrument(self.data_mgr, ('load_data', 'save_data'), 'data.')
+            self.heartbeat_expected = time.monotonic() + HEARTBEAT_MS / 1000
+            self.heartbeat = self.root.after(HEARTBEAT_MS, self.on_heartbeat)
+        else:
+            self.profiler.uninstrument()
+
+    def set_api(self, enabled):
+        # port from $ZENTASK_API (e.g. ZENTASK_API=8765), else the default
+        if self.core is None or enabled == (self.api is not None):
+            self.var_api.set(self.api is not None)
+            return
+        if not enabled:
+            self.api.close()
+            self.api = None
+            return
+        from zentask_api import ApiServer, API_PORT
+        port = os.environ.get('ZENTASK_API', '')
+        try:
+            self.api = ApiServer(self.core, port=int(port) if port.isdigit() else API_PORT)
+        except OSError as e:
+            messagebox.showerror("Local API Server", f"Could not start the server: {e}")
+            self.var_api.set(False)
+            return
+        self.api.start()
+        self.var_api.set(True)
+
+    def on_heartbeat(self):
+        # how late the main loop ran a callback that was due HEARTBEAT_MS ago
+        now = time.monotonic()
+        self.profiler.record('mainloop.latency', max(0.0, now - self.heartbeat_expected))
+        self.heartbeat_expected = now + HEARTBEAT_MS / 1000
+        self.heartbeat = self.root.after(HEARTBEAT_MS, self.on_heartbeat)
+
+    def diagnostics_extra(self):
+        return {
+            'profiling': self.profiler.enabled,
+            'timer_jitter': self.scheduler.jitter_stats(),
+            'theme_registry': self.theme_registry.report(),
+            'audio_dropped': self.audio.dropped,
+            'startup': self.startup,
+            'api': "http://%s:%d" % self.api.address if self.api is not None else None,
+        }
+
+    def open_diagnostics(self):
+        if self.diagnostics is not None:
+            self.diagnostics.window.lift()
+            return
+        self.diagnostics = DiagnosticsPanel(self)
+
+    def on_close(self):
+        if self.heartbeat is not None:
+            self.root.after_cancel(self.heartbeat)
+        self.scheduler.stop()
+        if self.api is not None:
+            self.api.close()
+        if self.core is None and hasattr(self, 'loader'):
+            # closed mid-load: let the loader finish so its files get closed too
+            self.loader.join()
+            if not isinstance(self.load_result, Exception):
+                self.core = self.load_result
+        self.save()
+        if self.core is not None:
+            self.core.close()
+        self.audio.close()
+        self.root.destroy()
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = ZenTaskChronos(root)
     root.mainloop()
\ No newline at end of file
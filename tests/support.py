@@ -0,0 +1,31 @@
+# Shared fixtures: a temp directory per test and cores opened inside it.
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zentask_core import ZenTaskCore, EventStore, SimulatedClock
+
+class TempDirTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix='zentask-test-')
+        self.cores = []
+
+    def tearDown(self):
+        for core in self.cores:
+            core.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def open_core(self, data_mgr, events='events.jsonl', clock=None):
+        core = ZenTaskCore(data_mgr, EventStore(self.path(events)), clock=clock or SimulatedClock(), wall_clock=lambda: 0.0)
+        self.cores.append(core)
+        return core
+
+    def task_texts(self, core):
+        return sorted((task['id'], task['text']) for task in core.data['tasks'])
@@ -0,0 +1,93 @@
+import http.client
+import json
+import unittest
+
+from support import TempDirTest
+from zentask_core import DataManager
+from zentask_api import ApiServer
+
+class ApiTest(TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.core = self.open_core(DataManager(self.path('data.json')))
+        for i in range(25):
+            self.core.add_task(f"task {i}", ('Low', 'Medium', 'High')[i % 3])
+        self.server = ApiServer(self.core, port=0)
+        self.server.start()
+        self.addCleanup(self.server.close)
+        self.host, self.port = self.server.address
+
+    def request(self, path, headers=None):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        conn.request('GET', path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return response, json.loads(body) if body else None
+
+    def test_cursor_pages_cover_every_task_once(self):
+        for sort_val in ('None', 'Priority'):
+            seen, cursor = [], ''
+            while True:
+                response, body = self.request(f"/api/tasks?sort={sort_val}&limit=10&cursor={cursor}")
+                self.assertEqual(response.status, 200)
+                seen += body['tasks']
+                cursor = body['next_cursor']
+                if cursor is None:
+                    break
+            self.assertEqual(sorted(task['id'] for task in seen), list(range(1, 26)))
+            if sort_val == 'Priority':
+                ranks = [('Low', 'Medium', 'High').index(task['priority']) for task in seen]
+                self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_etag_revalidation(self):
+        response, _ = self.request('/api/tasks?filter=Pending')
+        etag = response.getheader('ETag')
+        response, body = self.request('/api/tasks?filter=Pending', {'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertIsNone(body)
+        self.core.add_task('one more')
+        response, body = self.request('/api/tasks?filter=Pending', {'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader('ETag'), etag)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.request('/api/tasks?sort=Sideways')[0].status, 400)
+        self.assertEqual(self.request('/api/tasks/999')[0].status, 404)
+        self.assertEqual(self.request('/api/stats?period=yearly')[0].status, 400)
+        response, body = self.request('/api/tasks/3')
+        self.assertEqual((response.status, body['text']), (200, 'task 2'))
+
+    def test_foreign_host_is_refused(self):
+        response, _ = self.request('/api/tasks', {'Host': f"attacker.example:{self.port}"})
+        self.assertEqual(response.status, 403)
+        response, _ = self.request('/api/stats', {'Host': f"localhost:{self.port}"})
+        self.assertEqual(response.status, 200)
+
+    def test_events_stream(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        conn.request('GET', '/api/events')
+        response = conn.getresponse()
+        self.assertEqual(response.getheader('Content-Type'), 'text/event-stream')
+
+        def next_event():
+            fields = {}
+            while True:
+                line = response.fp.readline().decode().rstrip('\n')
+                if not line:
+                    return fields
+                name, _, value = line.partition(': ')
+                fields[name] = value
+
+        self.assertEqual(next_event()['event'], 'timer')
+        self.core.add_task('streamed')
+        while True:
+            event = next_event()
+            if event['event'] != 'tick':
+                break
+        self.assertEqual(event['event'], 'task_added')
+        self.assertEqual(json.loads(event['data'])['task']['text'], 'streamed')
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
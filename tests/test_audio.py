@@ -0,0 +1,53 @@
+import io
+import os
+import threading
+import unittest
+import wave
+
+from support import TempDirTest
+from zentask_core import AudioEngine, FileSink, NullSink, synthesize_cue, SOUND_CUES, AUDIO_RATE
+
+class GateSink(NullSink):
+    # holds the audio worker inside play() until the test opens the gate
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def play(self, cue, wav):
+        super().play(cue, wav)
+        self.entered.set()
+        self.gate.wait(5)
+
+class AudioTest(TempDirTest):
+    def test_cues_are_valid_wav(self):
+        with wave.open(io.BytesIO(synthesize_cue(SOUND_CUES['success'])), 'rb') as w:
+            self.assertEqual((w.getnchannels(), w.getsampwidth(), w.getframerate()), (1, 2, AUDIO_RATE))
+            self.assertEqual(w.getnframes(), sum(int(AUDIO_RATE * duration) for _, duration in SOUND_CUES['success']))
+
+    def test_file_sink_records_each_cue_in_order(self):
+        directory = self.path('cues')
+        engine = AudioEngine(FileSink(directory))
+        for cue in ('success', 'warning', 'notification'):
+            engine.play(cue)
+        engine.close()
+        self.assertEqual(sorted(os.listdir(directory)), ['0001-success.wav', '0002-warning.wav', '0003-notification.wav'])
+        with open(os.path.join(directory, '0003-notification.wav'), 'rb') as f:
+            self.assertEqual(f.read(), synthesize_cue(SOUND_CUES['notification']))
+
+    def test_bursts_are_coalesced_and_overflow_dropped(self):
+        sink = GateSink()
+        engine = AudioEngine(sink, maxsize=2)
+        engine.play('notification')
+        self.assertTrue(sink.entered.wait(5))
+        for _ in range(3):
+            engine.play('success')
+        engine.play('warning')
+        engine.play('extra')
+        self.assertEqual(engine.dropped, 1)
+        sink.gate.set()
+        engine.close()
+        self.assertEqual(sink.played, ['notification', 'success', 'warning'])
+
+if __name__ == '__main__':
+    unittest.main()
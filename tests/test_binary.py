@@ -0,0 +1,61 @@
+import contextlib
+import io
+import json
+import unittest
+
+from support import TempDirTest
+from zentask_core import DataManager, BinaryDataManager, Task, TaskFile, pack_data
+import zentask_cli
+
+TASKS = [
+    {'text': 'plain', 'completed': False, 'priority': 'High', 'id': 1},
+    {'text': 'done', 'completed': True, 'priority': 'Low', 'id': 2},
+    {'text': 'no priority', 'completed': False, 'id': 3},
+    {'text': 'null priority', 'completed': False, 'priority': None, 'id': 4},
+    {'text': 'no id', 'completed': False, 'priority': 'Medium'},
+    {'text': 'odd values', 'completed': 1, 'priority': 3, 'id': 6, 'due': '2026-01-01'},
+    {'text': 12, 'completed': False, 'priority': 'Urgent', 'id': 7},
+    {'text': 'ünïcode ✓', 'completed': True, 'priority': 'High', 'id': 8},
+]
+
+class BinaryTest(TempDirTest):
+    def test_pack_round_trip(self):
+        data = {**DataManager.default_data(), 'tasks': [Task.from_dict(task) for task in TASKS], 'xp': 42}
+        path = self.path('data.ztb')
+        with open(path, 'wb') as f:
+            f.write(pack_data(data))
+        with TaskFile(path) as f:
+            self.assertEqual([dict(task) for task in f], TASKS)
+            self.assertEqual(dict(f[-1]), TASKS[-1])
+            loaded = f.load()
+        self.assertEqual([dict(task) for task in loaded['tasks']], TASKS)
+        self.assertEqual(loaded['xp'], 42)
+
+    def test_json_reads_build_the_same_tasks(self):
+        path = self.path('data.json')
+        with open(path, 'w') as f:
+            json.dump({'tasks': TASKS}, f)
+        tasks = DataManager(path).read_data()['tasks']
+        self.assertTrue(all(type(task) is Task for task in tasks))
+        self.assertEqual([dict(task) for task in tasks], TASKS)
+
+    def test_convert_both_ways_is_lossless(self):
+        with open(self.path('data.json'), 'w') as f:
+            json.dump({**DataManager.default_data(), 'tasks': TASKS, 'next_task_id': 9}, f, indent=4)
+        with contextlib.redirect_stderr(io.StringIO()):
+            zentask_cli.main(['convert', self.path('data.json'), self.path('data.ztb')])
+            zentask_cli.main(['convert', self.path('data.ztb'), self.path('back.json')])
+        with open(self.path('data.json')) as a, open(self.path('back.json')) as b:
+            self.assertEqual(json.load(a), json.load(b))
+
+    def test_binary_engine_saves_and_loads(self):
+        path = self.path('data.ztb')
+        core = self.open_core(BinaryDataManager(path, self.path('missing.json')))
+        core.add_task('first', 'High')
+        core.toggle_task(core.add_task('second', 'Low'))
+        loaded = BinaryDataManager(path, self.path('missing.json')).load_data()
+        self.assertEqual([dict(task) for task in loaded['tasks']], [dict(task) for task in core.data['tasks']])
+        self.assertEqual(loaded['xp'], core.data['xp'])
+
+if __name__ == '__main__':
+    unittest.main()
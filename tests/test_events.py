@@ -0,0 +1,57 @@
+import os
+import unittest
+from datetime import datetime, date
+
+from support import TempDirTest
+from zentask_core import DataManager, EventStore, apply_event, current_streak, rollup_series, events_file_for
+
+def ts(day):
+    return datetime(2026, 3, day, 12).timestamp()
+
+class RollupTest(unittest.TestCase):
+    def test_buckets_and_streak(self):
+        rollups = DataManager.default_data()['rollups']
+        for day in (2, 3, 3, 5, 6, 7):
+            apply_event(rollups, {'type': 'session', 'ts': ts(day), 'minutes': 25})
+        apply_event(rollups, {'type': 'xp', 'ts': ts(3), 'amount': 10, 'reason': 'task'})
+        self.assertEqual(rollups['daily']['2026-03-03'], {'sessions': 2, 'minutes': 50, 'xp': 10, 'tasks': 1})
+        self.assertEqual(rollups['weekly']['2026-W10']['sessions'], 6)
+        self.assertEqual(rollups['monthly']['2026-03']['minutes'], 150)
+        self.assertEqual((rollups['streak']['current'], rollups['streak']['best']), (3, 3))
+        self.assertEqual(current_streak(rollups, date(2026, 3, 8)), 3)
+        self.assertEqual(current_streak(rollups, date(2026, 3, 9)), 0)
+        series = rollup_series(rollups, 'daily', 3, date(2026, 3, 4))
+        self.assertEqual([(day.day, bucket['sessions']) for day, bucket in series], [(2, 1), (3, 2), (4, 0)])
+
+class EventStoreTest(TempDirTest):
+    def test_rebuild_matches_the_live_rollups(self):
+        days = iter([ts(1), ts(1), ts(2), ts(2), ts(2), ts(4)])
+        core = self.open_core(DataManager(self.path('data.json')))
+        core.wall_clock = lambda: next(days)
+        core.add_xp(5)
+        core.complete_session()
+        core.complete_session()
+        live = core.data['rollups']
+        rebuilt = core.events.rebuild()
+        self.assertEqual(rebuilt, live)
+
+        core.data['rollups'] = DataManager.default_data()['rollups']
+        core.rebuild_rollups()
+        self.assertEqual(DataManager(self.path('data.json')).load_data()['rollups'], live)
+
+    def test_appends_are_written_behind(self):
+        store = EventStore(self.path('events.jsonl'), interval=60)
+        store.append({'type': 'xp', 'ts': ts(1), 'amount': 1})
+        self.assertFalse(os.path.exists(store.filename))
+        self.assertEqual(len(list(store)), 1)
+        store.append({'type': 'xp', 'ts': ts(1), 'amount': 2})
+        store.close()
+        self.assertEqual([event['amount'] for event in EventStore(store.filename)], [1, 2])
+
+    def test_log_sits_beside_its_data_file(self):
+        self.assertEqual(events_file_for('zentask_data.json'), 'zentask_events.jsonl')
+        self.assertEqual(events_file_for(os.path.join('sub', 'zentask_data.ztb')), os.path.join('sub', 'zentask_events.jsonl'))
+        self.assertEqual(events_file_for(os.path.join('sub', 'mine.json')), os.path.join('sub', 'mine.events.jsonl'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import threading
+import unittest
+
+from support import TempDirTest
+from zentask_core import DataManager, SQLiteDataManager, ImportCancelled, IMPORT_PROGRESS_EVERY
+
+def jsonl(*rows):
+    return io.BytesIO(''.join(row + '\n' for row in rows).encode())
+
+class ImportTest(TempDirTest):
+    def test_rows_are_validated(self):
+        core = self.open_core(DataManager(self.path('data.json')))
+        f = io.BytesIO('\ufefftext,completed,priority\nWrite,yes,high\n,no,Low\nRead,maybe,Low\nShip,,Urgent\nTest,0,\n'.encode())
+        report = core.import_tasks(f, 'csv')
+        self.assertEqual((report['imported'], report['rejected']), (2, 3))
+        self.assertEqual(report['errors'], ["line 3: missing text", "line 4: bad completed value 'maybe'",
+                                            "line 5: bad priority 'Urgent'"])
+        self.assertEqual([(t['text'], t['completed'], t['priority']) for t in core.data['tasks']],
+                         [('Write', True, 'High'), ('Test', False, 'Medium')])
+
+        report = core.import_tasks(jsonl('{"text": "one"}', '[1, 2]', 'not json', '{"text": "two", "completed": true}'), 'jsonl')
+        self.assertEqual((report['imported'], report['rejected']), (2, 2))
+        self.assertEqual(self.task_texts(core), [(1, 'Write'), (2, 'Test'), (3, 'one'), (4, 'two')])
+
+    def test_export_round_trip(self):
+        core = self.open_core(DataManager(self.path('data.json')))
+        core.add_task('first, with a comma', 'High')
+        core.toggle_task(core.add_task('second "quoted"', 'Low'))
+        for fmt in ('csv', 'jsonl'):
+            text = io.StringIO()
+            self.assertEqual(core.export_tasks(text, fmt), 2)
+            other = self.open_core(DataManager(self.path(f"copy.{fmt}.json")), f"copy.{fmt}.jsonl")
+            other.import_tasks(io.BytesIO(text.getvalue().encode()), fmt)
+            self.assertEqual([(t['text'], t['completed'], t['priority']) for t in other.data['tasks']],
+                             [(t['text'], t['completed'], t['priority']) for t in core.data['tasks']])
+
+    def test_cancel_leaves_data_untouched(self):
+        for data_mgr in (DataManager(self.path('data.json')), SQLiteDataManager(self.path('data.db'), self.path('none.json'))):
+            core = self.open_core(data_mgr, f"{id(data_mgr)}.jsonl")
+            core.add_task('existing')
+            cancel = threading.Event()
+            rows = [f'{{"text": "row {i}"}}' for i in range(3 * IMPORT_PROGRESS_EVERY)]
+            with self.assertRaises(ImportCancelled):
+                core.import_tasks(jsonl(*rows), 'jsonl', lambda count, pos: count > IMPORT_PROGRESS_EVERY and cancel.set(), cancel)
+            self.assertEqual([task['text'] for task in core.tasks.query()], ['existing'])
+            report = core.import_tasks(jsonl(*rows), 'jsonl')
+            self.assertEqual(report['imported'], len(rows))
+            self.assertEqual(len(core.tasks.query()), len(rows) + 1)
+            self.assertEqual(len(core.tasks.query('All', 'None', 'row 1499')), 1)
+
+    def test_merge_during_import_keeps_imported_tasks_indexed(self):
+        path = self.path('data.json')
+        core = self.open_core(DataManager(path))
+        for text in ('a', 'b', 'c'):
+            core.add_task(text)
+        other = self.open_core(DataManager(path), 'other.jsonl')
+
+        def progress(count, pos):
+            # another instance deletes a task and the app syncs mid-import,
+            # as the import dialog's event pumping lets it do
+            if count == IMPORT_PROGRESS_EVERY:
+                other.delete_task(other.tasks.get(1))
+                core.sync()
+                core.data_mgr.fetcher.join()
+                self.assertIsNotNone(core.sync())
+
+        rows = [f'{{"text": "imported {i}"}}' for i in range(IMPORT_PROGRESS_EVERY + 10)]
+        core.import_tasks(jsonl(*rows), 'jsonl', progress)
+        self.assertEqual(len(core.tasks.query()), len(rows) + 2)
+        self.assertEqual(len(core.tasks.query('All', 'None', 'imported')), len(rows))
+        self.assertEqual(set(core.tasks.index.by_id), {task['id'] for task in core.data['tasks']})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+import support  # puts the repository on sys.path
+from zentask_core import TaskIndex, TaskStore
+
+WORDS = "plan write review fix ship call email draft test refactor design read".split()
+
+def brute_force(tasks, filter_val, sort_val, search):
+    rank = TaskStore.rank(sort_val)
+    return [task['id'] for task in sorted(tasks, key=lambda task: (rank(task), task['id']))
+            if TaskStore.matches(task, filter_val) and TaskIndex.matches_search(task, search)]
+
+class TaskIndexTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.tasks = [{'text': ' '.join(rng.sample(WORDS, 3)), 'completed': rng.random() < 0.3,
+                       'priority': rng.choice(['High', 'Medium', 'Low']), 'id': i} for i in range(1, 301)]
+        del self.tasks[5]['priority']
+        self.tasks[6]['priority'] = 'Someday'
+        self.index = TaskIndex(self.tasks)
+
+    def assert_views_match(self):
+        for filter_val in TaskStore.FILTERS:
+            for sort_val in TaskStore.SORTS:
+                for search in ('', 're', 'write', 'fix sh', 'zzz'):
+                    self.assertEqual(self.index.sorted_ids(filter_val, sort_val, search),
+                                     brute_force(self.tasks, filter_val, sort_val, search), (filter_val, sort_val, search))
+
+    def test_views_match_a_full_scan(self):
+        self.assert_views_match()
+
+    def test_prefix_search(self):
+        self.assertEqual(self.index.prefix_ids('re'), self.index.prefix_ids('review') | self.index.prefix_ids('refactor')
+                         | self.index.prefix_ids('read'))
+        self.assertEqual(self.index.prefix_ids('q'), set())
+        self.assertEqual(self.index.tokens, sorted(WORDS))
+
+    def test_updates_keep_the_index_current(self):
+        task = self.tasks[0]
+        old = dict(task)
+        task.update({'text': 'quarterly budget', 'completed': not task['completed'], 'priority': 'High'})
+        self.index.update(task, old)
+        for gone in self.tasks[10:20]:
+            self.tasks.remove(gone)
+            self.index.remove(gone)
+        new = {'text': 'budget review', 'completed': False, 'priority': 'Low', 'id': 301}
+        self.tasks.append(new)
+        self.index.add(new)
+        self.assertEqual(self.index.sorted_ids('All', 'None', 'budg'), [1, 301])
+        self.assertIn('quarterly', self.index.tokens)
+        self.assert_views_match()
+        for task in list(self.tasks):
+            self.index.remove(task)
+        self.assertEqual((self.index.tokens, self.index.postings), ([], {}))
+
+if __name__ == '__main__':
+    unittest.main()
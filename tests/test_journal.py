@@ -0,0 +1,57 @@
+import os
+import unittest
+
+from support import TempDirTest
+from zentask_core import DataManager, JournalDataManager, Task
+
+class JournalTest(TempDirTest):
+    def crash(self, mgr):
+        # the writer stops without the compaction a clean close would run
+        mgr.flush()
+        mgr.stopping.set()
+        mgr.writer.join()
+        mgr.journal_file.close()
+        mgr.instance_lock.release()
+
+    def test_replay_truncates_torn_tail(self):
+        path = self.path('data.json')
+        mgr = JournalDataManager(path)
+        data = mgr.load_data()
+        mgr.add_task(data, Task('kept', False, 'Medium'))
+        mgr.add_task(data, Task('also kept', False, 'High'))
+        self.crash(mgr)
+        journal = mgr.journal_path(mgr.generation)
+        good = os.path.getsize(journal)
+        with open(journal, 'ab') as f:
+            f.write(JournalDataManager.encode({'op': 'task_add', 'task': Task('lost', False, 'Low', 3)})[:-5])
+
+        mgr = JournalDataManager(path)
+        data = mgr.load_data()
+        self.assertEqual([(task['id'], task['text']) for task in data['tasks']], [(1, 'kept'), (2, 'also kept')])
+        self.assertEqual(os.path.getsize(journal), good)
+        mgr.add_task(data, Task('after the crash', False, 'Low'))
+        mgr.close()
+
+        data = JournalDataManager(path).load_data()
+        self.assertEqual([task['text'] for task in data['tasks']], ['kept', 'also kept', 'after the crash'])
+
+    def test_close_compacts_into_a_plain_snapshot(self):
+        path = self.path('data.json')
+        mgr = JournalDataManager(path)
+        data = mgr.load_data()
+        task = Task('write', False, 'Medium')
+        mgr.add_task(data, task)
+        mgr.update_task(data, task, {'completed': True})
+        mgr.add_xp(data, 10)
+        data['current_theme'] = 'light'
+        mgr.save_data(data)
+        mgr.close()
+
+        self.assertEqual(mgr.journal_generations(), [])
+        # the snapshot is an ordinary data file the json engine can read
+        snapshot = DataManager(path).load_data()
+        self.assertEqual([dict(task) for task in snapshot['tasks']], [{'text': 'write', 'completed': True, 'priority': 'Medium', 'id': 1}])
+        self.assertEqual((snapshot['xp'], snapshot['current_theme']), (10, 'light'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from support import TempDirTest
+from zentask_core import DataManager, JournalDataManager, DataLockedError
+
+class MergeTest(TempDirTest):
+    def test_concurrent_adds_are_renumbered(self):
+        path = self.path('data.json')
+        first = self.open_core(DataManager(path), 'first.jsonl')
+        second = self.open_core(DataManager(path), 'second.jsonl')
+        events = []
+        second.subscribe(lambda kind, info: events.append(kind))
+        ours = first.add_task('from first')
+        theirs = second.add_task('from second')
+        self.assertEqual(ours['id'], 1)
+        # both handed out id 1; the later save moved its own task to a fresh id
+        self.assertEqual(theirs['id'], 2)
+        self.assertIn('tasks_reloaded', events)
+        self.assertEqual(self.task_texts(second), [(1, 'from first'), (2, 'from second')])
+        self.assertEqual(second.data['next_task_id'], 3)
+        self.assertEqual(sorted(second.tasks.index.by_id), [1, 2])
+
+        first.sync()
+        first.data_mgr.fetcher.join()
+        first.sync()
+        self.assertEqual(self.task_texts(first), [(1, 'from first'), (2, 'from second')])
+        with open(path) as f:
+            self.assertEqual(len(json.load(f)['tasks']), 2)
+
+    def test_three_way_merge_keeps_both_sides(self):
+        path = self.path('data.json')
+        seed = self.open_core(DataManager(path), 'seed.jsonl')
+        for text in ('one', 'two', 'three'):
+            seed.add_task(text)
+        first = self.open_core(DataManager(path), 'first.jsonl')
+        second = self.open_core(DataManager(path), 'second.jsonl')
+
+        first.edit_task(first.tasks.get(1), 'one, edited')
+        first.data['current_theme'] = 'light'
+        first.add_xp(5)
+        first.delete_task(first.tasks.get(3))
+        second.tasks.update(second.tasks.get(1), {'priority': 'High'})
+        second.data['current_filter'] = 'Pending'
+        second.add_xp(7)
+
+        for data in (second.data, DataManager(path).load_data()):
+            task = {t['id']: t for t in data['tasks']}
+            self.assertEqual(sorted(task), [1, 2])
+            self.assertEqual((task[1]['text'], task[1]['priority']), ('one, edited', 'High'))
+            self.assertEqual((data['current_theme'], data['current_filter']), ('light', 'Pending'))
+            # counters add up rather than one side's total winning
+            self.assertEqual(data['xp'], 12)
+        self.assertNotIn(3, second.tasks.index.by_id)
+
+    def test_journal_refuses_a_second_instance(self):
+        path = self.path('data.json')
+        self.open_core(JournalDataManager(path))
+        with self.assertRaises(DataLockedError):
+            JournalDataManager(path).load_data()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import contextlib
+import io
+import unittest
+
+from support import TempDirTest
+from zentask_core import DataManager, SimulatedClock
+import zentask_cli
+
+class SessionTest(TempDirTest):
+    def test_focus_session_with_simulated_clock(self):
+        clock = SimulatedClock()
+        core = self.open_core(DataManager(self.path('data.json')), clock=clock)
+        events = []
+        core.subscribe(lambda kind, info: events.append((kind, info)))
+        core.timer.set_mode('Focus', 2)
+        self.assertTrue(core.timer.start())
+        while not core.tick(clock.advance(1)):
+            pass
+        self.assertEqual(clock(), 120)
+        self.assertEqual(core.data['completed_focus_sessions'], 1)
+        # credited with the two minutes that ran, not the 25 minute setting
+        self.assertEqual(core.data['total_focus_time'], 2)
+        self.assertEqual(core.data['xp'], 2 + 50)
+        self.assertIn(('session_complete', {'minutes': 2}), events)
+        self.assertIn(('period_finished', {'mode': 'Focus'}), events)
+        self.assertFalse(core.timer.running)
+        self.assertEqual(core.timer.seconds_left, 120)
+
+    def test_tasks_award_xp_and_level_up(self):
+        core = self.open_core(DataManager(self.path('data.json')))
+        kinds = []
+        core.subscribe(lambda kind, info: kinds.append(kind))
+        self.assertIsNone(core.add_task('   '))
+        tasks = [core.add_task(f"task {i}") for i in range(10)]
+        for task in tasks:
+            core.toggle_task(task)
+        self.assertEqual((core.data['xp'], core.data['level']), (100, 2))
+        self.assertEqual(kinds.count('level_up'), 1)
+        core.toggle_task(tasks[0])
+        self.assertEqual(core.data['xp'], 100)
+        self.assertTrue(core.edit_task(tasks[1], 'renamed'))
+        self.assertFalse(core.edit_task(tasks[1], 'renamed'))
+        core.delete_task(tasks[2])
+        saved = DataManager(self.path('data.json')).load_data()
+        self.assertEqual([task['text'] for task in saved['tasks'][:2]], ['task 0', 'renamed'])
+        self.assertEqual(len(saved['tasks']), 9)
+
+class CliTest(TempDirTest):
+    def cli(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            zentask_cli.main(['--data', self.path('data.json'), *argv])
+        return out.getvalue()
+
+    def test_commands_share_the_data_file(self):
+        self.cli('add', 'Write', 'the', 'report', '--priority', 'High')
+        self.cli('add', 'Read', 'mail')
+        self.cli('done', '2')
+        self.assertEqual(self.cli('list', '--sort', 'Priority').splitlines(),
+                         ["    1. ○ Write the report [High]", "    2. ✓ Read mail [Medium]"])
+        self.assertEqual(self.cli('list', 'rep').splitlines(), ["    1. ○ Write the report [High]"])
+        self.assertIn("Focus finished (2 min)", self.cli('run', '--minutes', '2', '--simulate'))
+        stats = self.cli('stats')
+        self.assertIn("Sessions completed: 1", stats)
+        self.assertIn("Total focus time:   2 m", stats)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from support import TempDirTest
+from zentask_core import SQLiteDataManager, Task
+
+class SQLiteTest(TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.json_path = self.path('data.json')
+        tasks = [{'text': f"task {i}", 'completed': i % 4 == 0, 'priority': ('Low', 'Medium', 'High')[i % 3], 'id': i}
+                 for i in range(1, 601)]
+        with open(self.json_path, 'w') as f:
+            json.dump({'tasks': tasks, 'xp': 120, 'level': 2, 'next_task_id': 601}, f)
+
+    def open_mgr(self):
+        mgr = SQLiteDataManager(self.path('data.db'), self.json_path)
+        self.addCleanup(mgr.close)
+        return mgr, mgr.load_data()
+
+    def test_first_load_migrates_the_json_file(self):
+        mgr, data = self.open_mgr()
+        self.assertEqual(len(data['tasks']), 600)
+        self.assertEqual((data['xp'], data['level']), (120, 2))
+        self.assertEqual(dict(data['tasks'][0]), {'id': 1, 'text': 'task 1', 'completed': False, 'priority': 'Medium'})
+
+    def test_paged_queries_match_a_full_scan(self):
+        mgr, data = self.open_mgr()
+        everything = list(mgr.query_tasks('All', 'None'))
+        for filter_val, keep in (('Completed', lambda t: t['completed']), ('Pending', lambda t: not t['completed'])):
+            query = mgr.query_tasks(filter_val, 'Priority', '5')
+            expected = sorted((t for t in everything if keep(t) and '5' in t['text']),
+                              key=lambda t: (-{'Low': 1, 'Medium': 2, 'High': 3}[t['priority']], t['id']))
+            self.assertEqual(len(query), len(expected))
+            # random access pages rows in, backwards as well as forwards
+            self.assertEqual([query[i] for i in reversed(range(len(query)))], expected[::-1])
+            self.assertLessEqual(len(query.pages), query.MAX_PAGES)
+
+    def test_writes_persist_and_invalidate_open_queries(self):
+        mgr, data = self.open_mgr()
+        pending = mgr.query_tasks('Pending', 'None')
+        before = len(pending)
+        mgr.add_task(data, Task('new', False, 'High'))
+        task = mgr.get_task(2)
+        mgr.update_task(data, task, {'completed': True})
+        mgr.delete_task(data, mgr.get_task(3))
+        data['xp'] += 5
+        mgr.save_data(data)
+        self.assertEqual(len(pending), before - 1)
+        mgr.close()
+
+        mgr, data = self.open_mgr()
+        self.assertEqual(mgr.get_task(601)['text'], 'new')
+        self.assertTrue(mgr.get_task(2)['completed'])
+        self.assertIsNone(mgr.get_task(3))
+        self.assertEqual(data['xp'], 125)
+
+if __name__ == '__main__':
+    unittest.main()
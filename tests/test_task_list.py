@@ -0,0 +1,103 @@
+# TaskListView over a stub canvas, so the row pool can be checked headless
+import unittest
+from types import SimpleNamespace
+
+import support  # puts the repository on sys.path
+from focus_app import TaskListView
+
+class StubWidget:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+class StubCanvas:
+    def __init__(self, height):
+        self.height = height
+        self.top = 0
+        self.items = {}
+
+    def configure(self, **options):
+        pass
+
+    def bind(self, sequence, func):
+        pass
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def winfo_height(self):
+        return self.height
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def coords(self, item, x, y):
+        self.items[item]['y'] = y
+
+class StubListView(TaskListView):
+    def create_row(self, width):
+        window = len(self.canvas.items)
+        self.canvas.items[window] = {'state': 'hidden', 'y': 0}
+        return {'pos': None, 'shown': False, 'window': window, 'check': StubWidget(), 'label': StubWidget()}
+
+def make_view(rows_visible=3):
+    canvas = StubCanvas(rows_visible * TaskListView.ROW_HEIGHT)
+    theme_mgr = SimpleNamespace(colors={'text': 'white', 'text_dim': 'grey'})
+    clicked = []
+    view = StubListView(canvas, StubWidget(), theme_mgr, clicked.append, clicked.append, clicked.append, lambda w, role: None)
+    view.on_resize(SimpleNamespace(width=300, height=canvas.height))
+    return view
+
+def tasks(count):
+    return [{'id': i, 'text': f"t{i}", 'completed': False} for i in range(1, count + 1)]
+
+def drawn(view):
+    # the label of every shown row, top to bottom
+    shown = [row for row in view.rows if view.canvas.items[row['window']]['state'] == 'normal']
+    return [row['label'].options['text'] for row in sorted(shown, key=lambda row: view.canvas.items[row['window']]['y'])]
+
+class TaskListViewTest(unittest.TestCase):
+    def test_shorter_list_hides_old_rows(self):
+        view = make_view()
+        view.set_items([(task['id'], task) for task in tasks(10)])
+        self.assertEqual(drawn(view), [f"t{i}" for i in range(1, 9)])
+        view.set_items([(1, tasks(1)[0])])
+        self.assertEqual(drawn(view), ['t1'])
+        self.assertTrue(all(row['pos'] in (None, 0) for row in view.rows))
+
+    def test_remove_and_insert_patch_rows(self):
+        view = make_view(rows_visible=20)
+        items = tasks(10)
+        view.set_items([(task['id'], task) for task in items])
+        view.remove(items[4])
+        self.assertEqual(drawn(view), ['t1', 't2', 't3', 't4', 't6', 't7', 't8', 't9', 't10'])
+        view.insert(items[4])
+        self.assertEqual(drawn(view), [f"t{i}" for i in range(1, 11)])
+        view.remove(items[9])
+        view.remove(items[0])
+        self.assertEqual(drawn(view), [f"t{i}" for i in range(2, 10)])
+        for row in view.rows:
+            if row['pos'] is not None:
+                self.assertEqual(view.items[row['pos']]['text'], row['label'].options['text'])
+
+    def test_update_rebinds_only_its_row(self):
+        view = make_view()
+        items = tasks(3)
+        view.set_items([(task['id'], task) for task in items])
+        items[1]['completed'] = True
+        items[1]['text'] = 'done'
+        view.update(items[1])
+        self.assertEqual(drawn(view), ['t1', 'done', 't3'])
+        self.assertEqual(view.rows[1]['check'].options['text'], "✓")
+
+    def test_scrolling_rebinds_the_window(self):
+        view = make_view()
+        view.set_items([(task['id'], task) for task in tasks(100)])
+        view.canvas.top = 50 * TaskListView.ROW_HEIGHT
+        view.layout()
+        self.assertEqual(drawn(view), [f"t{i}" for i in range(47, 59)])
+
+if __name__ == '__main__':
+    unittest.main()
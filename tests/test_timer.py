@@ -0,0 +1,98 @@
+import unittest
+
+from support import TempDirTest
+from zentask_core import CountdownTimer, TimerEngine, SimulatedClock
+from focus_app import TickScheduler
+
+class StubRoot:
+    # after() callbacks are run by hand, in due order
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.calls[self.next_id] = (self.clock() + ms / 1000, func)
+        return self.next_id
+
+    def after_cancel(self, call_id):
+        self.calls.pop(call_id, None)
+
+    def run_next(self, late=0.0):
+        call_id = min(self.calls, key=lambda k: self.calls[k][0])
+        due, func = self.calls.pop(call_id)
+        self.clock.now = max(self.clock.now, due) + late
+        func()
+
+class CountdownTest(unittest.TestCase):
+    def test_remaining_follows_the_clock_across_pauses(self):
+        clock = SimulatedClock()
+        countdown = CountdownTimer(90, clock)
+        self.assertTrue(countdown.start())
+        clock.advance(30.5)
+        self.assertEqual(countdown.seconds_left(), 60)
+        self.assertEqual(countdown.next_boundary(clock()), 31.0)
+        countdown.pause()
+        clock.advance(100)
+        self.assertEqual(countdown.seconds_left(), 60)
+        countdown.start()
+        clock.advance(60)
+        self.assertEqual(countdown.seconds_left(), 0)
+        self.assertAlmostEqual(countdown.progress(), 1.0)
+
+    def test_engine_counts_skipped_minutes_and_rearms(self):
+        clock = SimulatedClock()
+        engine = TimerEngine(180, 'Focus', clock)
+        engine.start()
+        self.assertEqual(engine.advance(clock.advance(1)), (0, False))
+        # a stall across two minute boundaries still counts both
+        self.assertEqual(engine.advance(clock.advance(125)), (2, False))
+        self.assertEqual(engine.advance(clock.advance(60)), (1, True))
+        self.assertFalse(engine.running)
+        self.assertEqual(engine.seconds_left, 180)
+        self.assertTrue(engine.start())
+
+class TickSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(1000.25)
+        self.root = StubRoot(self.clock)
+        self.scheduler = TickScheduler(self.root, self.clock, wall=self.clock)
+
+    def test_ticks_land_on_second_and_countdown_boundaries(self):
+        ticks = []
+        countdown = CountdownTimer(10, self.clock)
+        self.scheduler.add_boundary(countdown.next_boundary)
+        self.scheduler.add_listener(ticks.append)
+        self.scheduler.start()
+        countdown.start()
+        self.scheduler.wake()
+        for _ in range(3):
+            self.root.run_next()
+        self.assertEqual(ticks, [1000.25, 1000.25, 1001.0, 1001.25, 1002.0])
+        self.assertEqual(len(self.root.calls), 1)
+
+    def test_a_listener_that_raises_or_stalls_keeps_the_clock_running(self):
+        calls = []
+
+        def listener(now):
+            calls.append(now)
+            if len(calls) == 2:
+                self.clock.advance(2.0)
+            if len(calls) == 3:
+                raise RuntimeError("listener failed")
+
+        self.scheduler.add_listener(listener)
+        self.scheduler.start()
+        self.root.run_next()
+        with self.assertRaises(RuntimeError):
+            self.root.run_next()
+        self.assertEqual(len(self.root.calls), 1)
+        self.root.run_next()
+        self.assertEqual(len(calls), 4)
+        stats = self.scheduler.jitter_stats()
+        self.assertEqual(stats['samples'], 3)
+        self.assertGreaterEqual(stats['max_ms'], 1000.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,332 @@
+import bisect
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from zentask_core import TaskStore, TaskIndex, TaskQuery, PRIORITY_RANK, current_streak, rollup_series
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+LIST_CACHE_SIZE = 8
+SSE_QUEUE_SIZE = 256
+SSE_EVENTS = ('task_added', 'task_updated', 'task_deleted', 'tasks_reloaded', 'tasks_imported',
+              'xp', 'level_up', 'period_finished', 'session_complete', 'synced')
+STATS_COUNTS = {'daily': 7, 'weekly': 8, 'monthly': 6}
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'index.html')
+
+def task_json(task):
+    return {'id': task['id'], 'text': task['text'], 'completed': bool(task['completed']),
+            'priority': task.get('priority', 'Medium')}
+
+def encode_cursor(key):
+    return f"{key[0]}:{key[1]}"
+
+def decode_cursor(cursor):
+    rank, _, task_id = cursor.partition(':')
+    return int(rank), int(task_id)
+
+class EventHub:
+    # fans core events out to SSE clients; publish runs on the core's thread,
+    # so payloads are serialized there and clients only ever see strings
+    def __init__(self):
+        self.clients = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        client = queue.Queue(SSE_QUEUE_SIZE)
+        with self.lock:
+            self.clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+
+    def publish(self, kind, info):
+        if kind not in SSE_EVENTS:
+            return
+        body = {k: v for k, v in info.items() if k != 'task'}
+        if 'task' in info:
+            body['task'] = task_json(info['task'])
+        self.send((kind, json.dumps(body)))
+
+    def send(self, item):
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                client.put_nowait(item)
+            except queue.Full:
+                # a stalled client misses events rather than holding up the app
+                pass
+
+    def close(self):
+        self.send(None)
+
+class ApiServer:
+    def __init__(self, core, host=API_HOST, port=API_PORT):
+        self.core = core
+        self.hub = EventHub()
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.local = threading.local()
+        self.httpd = ThreadingHTTPServer((host, port), ApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.api = self
+        self.thread = None
+        # a DNS-rebinding page reaches us under its own name, so only requests
+        # addressed to the loopback names or the bind host are answered
+        port = self.httpd.server_address[1]
+        names = {'127.0.0.1', 'localhost', host.lower()}
+        self.hosts = {f"{name}:{port}" for name in names}
+        if port == 80:
+            self.hosts |= names
+        core.subscribe(self.hub.publish)
+
+    @property
+    def address(self):
+        return self.httpd.server_address[:2]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='zentask-api', daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.core.unsubscribe(self.hub.publish)
+        self.hub.close()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reader(self):
+        # SQLite connections are bound to their thread, so each handler
+        # thread reads through its own
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.core.data_mgr.filename)
+        return conn
+
+    def list_tasks(self, filter_val, sort_val, search, cursor, limit):
+        if self.core.data_mgr.paged:
+            return self.list_tasks_sql(filter_val, sort_val, search, cursor, limit)
+        keys, tasks = self.sorted_tasks(filter_val, sort_val, search)
+        start = bisect.bisect_right(keys, cursor) if cursor else 0
+        page = tasks[start:start + limit]
+        more = start + limit < len(keys)
+        return [task_json(task) for task in page], encode_cursor(keys[start + limit - 1]) if more else None
+
+    def sorted_tasks(self, filter_val, sort_val, search):
+        # cursors page through one sorted copy per revision instead of re-sorting
+        key = (self.core.revision, filter_val, sort_val, search)
+        with self.cache_lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache.move_to_end(key)
+                return entry
+        with self.core.data_mgr.lock:
+            tasks = list(self.core.data['tasks'])
+        rank = TaskStore.rank(sort_val)
+        keyed = sorted(((rank(task), task['id']), task) for task in tasks
+                       if TaskStore.matches(task, filter_val) and (not search or TaskIndex.matches_search(task, search)))
+        entry = ([k for k, _ in keyed], [task for _, task in keyed])
+        with self.cache_lock:
+            self.cache[key] = entry
+            while len(self.cache) > LIST_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return entry
+
+    def list_tasks_sql(self, filter_val, sort_val, search, cursor, limit):
+        where, params = self.core.data_mgr.where(filter_val, search)
+        clauses = [where] if where else []
+        if sort_val == 'Priority':
+            order = 'prio_rank DESC, id'
+            if cursor:
+                clauses.append('(prio_rank < ? OR (prio_rank = ? AND id > ?))')
+                params += [-cursor[0], -cursor[0], cursor[1]]
+        else:
+            order = 'id'
+            if cursor:
+                clauses.append('id > ?')
+                params.append(cursor[1])
+        sql = 'SELECT id, text, completed, priority FROM tasks'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        rows = self.reader().execute(f"{sql} ORDER BY {order} LIMIT ?", (*params, limit + 1)).fetchall()
+        tasks = [TaskQuery.row_to_task(row) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return [task_json(task) for task in tasks], None
+        last = tasks[-1]
+        rank = -PRIORITY_RANK.get(last['priority'], 1) if sort_val == 'Priority' else 0
+        return [task_json(task) for task in tasks], encode_cursor((rank, last['id']))
+
+    def get_task(self, task_id):
+        if self.core.data_mgr.paged:
+            row = self.reader().execute('SELECT id, text, completed, priority FROM tasks WHERE id = ?', (task_id,)).fetchone()
+            return TaskQuery.row_to_task(row) if row else None
+        return self.core.data_mgr.by_id.get(task_id)
+
+    def stats(self, period, count):
+        data = self.core.data
+        rollups = data['rollups']
+        with self.core.data_mgr.lock:
+            series = [{'start': day.isoformat(), **bucket} for day, bucket in rollup_series(rollups, period, count)]
+            streak = {'current': current_streak(rollups), 'best': rollups['streak']['best']}
+        return {
+            'completed_focus_sessions': data['completed_focus_sessions'],
+            'total_focus_time': data['total_focus_time'],
+            'xp': data['xp'],
+            'level': data['level'],
+            'streak': streak,
+            'period': period,
+            'series': series,
+        }
+
+    def timer_state(self):
+        timer = self.core.timer
+        return {
+            'mode': timer.mode,
+            'running': timer.running,
+            'seconds_left': timer.countdown.seconds_left(),
+            'duration': timer.countdown.duration,
+            'progress': round(timer.countdown.progress(), 4),
+        }
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ZenTaskAPI/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        api = self.server.api
+        if self.headers.get('Host', '').lower() not in api.hosts:
+            self.send_error_json(403, "unexpected Host header")
+            return
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip('/') or '/'
+        try:
+            if path == '/':
+                self.send_file(INDEX_FILE, 'text/html; charset=utf-8')
+            elif path == '/api/tasks':
+                self.get_tasks(api, query, url.query)
+            elif path.startswith('/api/tasks/'):
+                task = api.get_task(int(path.rsplit('/', 1)[1]))
+                if task is None:
+                    self.send_error_json(404, "no such task")
+                else:
+                    self.send_json(lambda: task_json(task), self.revision_tag(api, path))
+            elif path == '/api/stats':
+                period = query.get('period', 'daily')
+                if period not in STATS_COUNTS:
+                    raise ValueError(f"period must be one of {', '.join(STATS_COUNTS)}")
+                count = min(int(query.get('count', STATS_COUNTS[period])), 366)
+                # the current streak also depends on today's date
+                tag = self.revision_tag(api, f"{url.query}|{date.today()}")
+                self.send_json(lambda: api.stats(period, count), tag)
+            elif path == '/api/timer':
+                state = api.timer_state()
+                self.send_json(lambda: state, f'W/"{zlib.crc32(json.dumps(state, sort_keys=True).encode()):08x}"')
+            elif path == '/api/events':
+                self.stream_events(api)
+            else:
+                self.send_error_json(404, "not found")
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+
+    def get_tasks(self, api, query, raw_query):
+        filter_val = query.get('filter', 'All')
+        sort_val = query.get('sort', 'None')
+        if filter_val not in TaskStore.FILTERS or sort_val not in TaskStore.SORTS:
+            raise ValueError(f"filter must be one of {', '.join(TaskStore.FILTERS)}; sort one of {', '.join(TaskStore.SORTS)}")
+        limit = max(1, min(int(query.get('limit', PAGE_LIMIT)), MAX_PAGE_LIMIT))
+        cursor = decode_cursor(query['cursor']) if query.get('cursor') else None
+
+        def body():
+            tasks, next_cursor = api.list_tasks(filter_val, sort_val, query.get('q', ''), cursor, limit)
+            return {'tasks': tasks, 'next_cursor': next_cursor}
+        self.send_json(body, self.revision_tag(api, raw_query))
+
+    @staticmethod
+    def revision_tag(api, key):
+        return f'W/"{api.core.revision}-{zlib.crc32(key.encode()):08x}"'
+
+    def not_modified(self, etag):
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(',')]
+        return '*' in tags or etag in tags or etag[2:] in tags
+
+    def send_json(self, body, etag):
+        # the tag is checked before the body is built, so a 304 costs no work
+        if self.not_modified(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        payload = json.dumps(body()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status, message):
+        payload = json.dumps({'error': message}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_file(self, path, content_type):
+        with open(path, 'rb') as f:
+            payload = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream_events(self, api):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        client = api.hub.subscribe()
+        try:
+            self.write_event('timer', json.dumps(api.timer_state()))
+            while True:
+                # ticks land on wall-clock second boundaries, like the app's clock
+                try:
+                    item = client.get(timeout=1.0 - time.time() % 1.0)
+                except queue.Empty:
+                    self.write_event('tick', json.dumps(api.timer_state()))
+                    continue
+                if item is None:
+                    break
+                self.write_event(*item)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            api.hub.unsubscribe(client)
+
+    def write_event(self, kind, data):
+        self.wfile.write(f"event: {kind}\ndata: {data}\n\n".encode())
+        self.wfile.flush()
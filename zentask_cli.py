@@ -0,0 +1,216 @@
+import argparse
+import os
+import sys
+import time
+
+from zentask_core import ZenTaskCore, TaskStore, ImportCancelled, DataLockedError, SimulatedClock, create_data_manager, current_streak, rollup_series
+
+MODE_SETTINGS = {'Focus': 'focus_time', 'Short Break': 'short_break_time', 'Long Break': 'long_break_time'}
+
+def open_core(args, clock=time.monotonic, wall_clock=time.time):
+    data_mgr = create_data_manager(args.storage, args.data, write_behind=False)
+    return ZenTaskCore(data_mgr, clock=clock, wall_clock=wall_clock)
+
+def pick_task(core, task_id):
+    task = core.tasks.get(task_id)
+    if task is None:
+        sys.exit(f"No task with id {task_id}")
+    return task
+
+def cmd_list(core, args):
+    for task in core.tasks.query(args.filter, args.sort, ' '.join(args.search)):
+        mark = "✓" if task['completed'] else "○"
+        print(f"{task['id']:>5}. {mark} {task['text']} [{task.get('priority', 'Medium')}]")
+
+def cmd_add(core, args):
+    task = core.add_task(' '.join(args.text), args.priority)
+    if task is None:
+        sys.exit("Task text is empty")
+    print(f"Added: {task['text']}")
+
+def cmd_edit(core, args):
+    task = pick_task(core, args.id)
+    if not core.edit_task(task, ' '.join(args.text)):
+        sys.exit("Nothing to change")
+    print(f"Edited: {task['text']}")
+
+def cmd_done(core, args):
+    task = pick_task(core, args.id)
+    if not task['completed']:
+        core.toggle_task(task)
+    print(f"Completed: {task['text']}")
+
+def cmd_delete(core, args):
+    task = pick_task(core, args.id)
+    core.delete_task(task)
+    print(f"Deleted: {task['text']}")
+
+def cmd_import(core, args):
+    fmt = args.format or TaskStore.format_for(args.file)
+    total = os.path.getsize(args.file)
+    progress = lambda rows, pos: print(f"\r{rows} rows ({pos * 100 // max(total, 1)}%)", end='', file=sys.stderr, flush=True)
+    try:
+        with open(args.file, 'rb') as f:
+            report = core.import_tasks(f, fmt, progress)
+    except (ImportCancelled, KeyboardInterrupt):
+        sys.exit("\nImport cancelled, nothing was added")
+    print(f"\rImported {report['imported']} tasks, rejected {report['rejected']}", file=sys.stderr)
+    for error in report['errors']:
+        print(f"  {error}", file=sys.stderr)
+
+def cmd_export(core, args):
+    fmt = args.format or TaskStore.format_for(args.file)
+    if args.file == '-':
+        count = core.export_tasks(sys.stdout, fmt)
+    else:
+        with open(args.file, 'w', newline='' if fmt == 'csv' else None, encoding='utf-8') as f:
+            count = core.export_tasks(f, fmt)
+    print(f"Exported {count} tasks", file=sys.stderr)
+
+def engine_for(path):
+    return 'binary' if path.endswith('.ztb') else 'json'
+
+def cmd_convert(args):
+    # the two layouts hold the same data, so a file converts either way and back unchanged
+    if not os.path.exists(args.source):
+        sys.exit(f"No such file: {args.source}")
+    if os.path.exists(args.target) and not args.force:
+        sys.exit(f"{args.target} exists (use --force to replace it)")
+    source = create_data_manager(engine_for(args.source), args.source, write_behind=False)
+    target = create_data_manager(engine_for(args.target), args.target, write_behind=False)
+    with source.file_lock:
+        data = source.read_file()
+    with target.file_lock:
+        if not target.write_file(target.dump_data(data, indent=4)):
+            sys.exit(1)
+    print(f"Converted {len(data['tasks'])} tasks: {args.source} -> {args.target}", file=sys.stderr)
+
+def cmd_run(core, args):
+    minutes = args.minutes or core.data['custom_timer_settings'][MODE_SETTINGS[args.mode]]
+    core.subscribe(lambda kind, info: print(f"\n⭐ Level {info['level']}!") if kind == 'level_up' else None)
+    core.timer.set_mode(args.mode, minutes)
+    core.timer.start()
+    clock = core.timer.countdown.clock
+    while True:
+        now = clock()
+        if core.tick(now):
+            break
+        if args.simulate:
+            clock.advance(1.0)
+            continue
+        core.sync()
+        left = core.timer.seconds_left
+        print(f"\r{args.mode}: {left // 60:02d}:{left % 60:02d}", end='', flush=True)
+        time.sleep(max(0.0, core.timer.countdown.next_boundary(now) - clock()))
+    print(f"\n{args.mode} finished ({minutes} min) • Lvl {core.data['level']} • {core.data['xp']} XP")
+
+def cmd_serve(core, args):
+    from zentask_api import ApiServer
+    server = ApiServer(core, args.host, args.port)
+    server.start()
+    host, port = server.address
+    print(f"Serving http://{host}:{port}/api/tasks, /api/stats, /api/timer and /api/events (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1.0)
+            # pick up saves from the app or other CLI runs
+            core.sync()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+def cmd_stats(core, args):
+    data = core.data
+    print(f"Sessions completed: {data['completed_focus_sessions']}")
+    print(f"Total focus time:   {data['total_focus_time']} m")
+    print(f"Level {data['level']} • {data['xp']} XP")
+    print(f"Focus streak:       {current_streak(data['rollups'])} days (best {data['rollups']['streak']['best']})")
+    for day, bucket in rollup_series(data['rollups'], 'daily', 7):
+        print(f"  {day:%a %d %b}  {bucket['minutes']:>4} m  {bucket['sessions']:>3} sessions")
+
+def cmd_rebuild_stats(core, args):
+    core.rebuild_rollups()
+    print(f"Rebuilt statistics from {core.events.filename}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='zentask_cli', description="ZenTask Chronos without the GUI")
+    parser.add_argument('--data', help="data file (defaults to the storage engine's file)")
+    parser.add_argument('--storage', choices=['json', 'journal', 'sqlite', 'binary'], help="storage engine (default: $ZENTASK_STORAGE or json)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('list', help="list tasks")
+    p.add_argument('--filter', choices=TaskStore.FILTERS, default='All')
+    p.add_argument('--sort', choices=TaskStore.SORTS, default='None')
+    p.add_argument('search', nargs='*', help="only tasks with words starting with these terms")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser('add', help="add a task")
+    p.add_argument('text', nargs='+')
+    p.add_argument('--priority', choices=['High', 'Medium', 'Low'], default='Medium')
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser('edit', help="change a task's text by its id")
+    p.add_argument('id', type=int)
+    p.add_argument('text', nargs='+')
+    p.set_defaults(func=cmd_edit)
+
+    p = sub.add_parser('done', help="complete a task by its id in `list`")
+    p.add_argument('id', type=int)
+    p.set_defaults(func=cmd_done)
+
+    p = sub.add_parser('delete', help="delete a task by its id in `list`")
+    p.add_argument('id', type=int)
+    p.set_defaults(func=cmd_delete)
+
+    p = sub.add_parser('import', help="add tasks from a CSV or JSON Lines file")
+    p.add_argument('file')
+    p.add_argument('--format', choices=TaskStore.FORMATS, help="default: from the file extension")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser('export', help="write all tasks to a CSV or JSON Lines file ('-' for stdout)")
+    p.add_argument('file')
+    p.add_argument('--format', choices=TaskStore.FORMATS, help="default: from the file extension")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('convert', help="convert a data file between JSON and the binary .ztb layout")
+    p.add_argument('source')
+    p.add_argument('target', help="the layout follows the extension")
+    p.add_argument('--force', action='store_true', help="replace an existing target")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser('run', help="run a timer session")
+    p.add_argument('--mode', choices=list(MODE_SETTINGS), default='Focus')
+    p.add_argument('--minutes', type=int)
+    p.add_argument('--simulate', action='store_true', help="run on a simulated clock at full speed")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('serve', help="serve tasks, stats and timer state as a local HTTP/JSON API")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('stats', help="show session statistics")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser('rebuild-stats', help="recompute the statistics from the event log")
+    p.set_defaults(func=cmd_rebuild_stats)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'convert':
+        args.func(args)
+        return
+    clock = SimulatedClock() if getattr(args, 'simulate', False) else time.monotonic
+    try:
+        core = open_core(args, clock=clock)
+    except DataLockedError as e:
+        sys.exit(str(e))
+    try:
+        args.func(core, args)
+    finally:
+        core.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2052 @@
+import math
+import bisect
+import mmap
+import struct
+import re
+import json
+import copy
+import zlib
+import os
+import time
+import weakref
+from datetime import datetime, date, timedelta
+import platform
+import sys
+import io
+import queue
+import shutil
+from array import array
+import tempfile
+import threading
+from collections import deque
+from itertools import chain, islice
+# sqlite3, wave, csv and subprocess are imported where they are used: each
+# serves one optional path and keeps cold start lean when it is not taken
+
+if platform.system() == 'Windows':
+    import winsound
+
+DATA_FILE = "zentask_data.json"
+SQLITE_FILE = "zentask_data.db"
+BINARY_FILE = "zentask_data.ztb"
+EVENTS_FILE = "zentask_events.jsonl"
+SAVE_INTERVAL = 2.0
+JOURNAL_FLUSH_INTERVAL = 0.5
+JOURNAL_COMPACT_INTERVAL = 300.0
+
+AUDIO_RATE = 22050
+AUDIO_QUEUE_SIZE = 4
+PROFILE_TRACE_SIZE = 10000
+SOUND_CUES = {
+    'notification': [(1000, 0.3)],
+    'success': [(1200, 0.15), (0, 0.05), (1400, 0.15)],
+    'warning': [(800, 0.2), (0, 0.05), (600, 0.2)],
+}
+PRIORITY_RANK = {'High': 3, 'Medium': 2, 'Low': 1}
+IMPORT_CHUNK = 1000
+IMPORT_PROGRESS_EVERY = 500
+IMPORT_MAX_ERRORS = 100
+COUNTER_KEYS = ('xp', 'completed_focus_sessions', 'total_focus_time')
+TRUE_VALUES = ('1', 'true', 'yes', 'y', 'done', 'x')
+FALSE_VALUES = ('', '0', 'false', 'no', 'n', 'pending')
+BINARY_MAGIC = b'ZTSK'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHIIQ')
+NO_PRIORITY = 255
+
+class Task:
+    # one slotted record per task instead of a dict, with the priority string
+    # interned: about half the memory. It reads and writes like the dict it
+    # replaces, so records, views and the API handle both. A field holding
+    # None is absent; anything outside the four fields lives in `extra`.
+    FIELDS = ('text', 'completed', 'priority', 'id')
+    FIELD_SET = frozenset(FIELDS)
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, text, completed=False, priority=None, id=None, extra=None):
+        self.text = text
+        self.completed = completed
+        self.priority = sys.intern(priority) if type(priority) is str else priority
+        self.id = id
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, fields):
+        if type(fields) is cls:
+            return fields
+        task = cls(fields.get('text'), fields.get('completed'), fields.get('priority'), fields.get('id'))
+        if len(fields) != 4 or None in (task.text, task.completed, task.priority, task.id):
+            for key, value in fields.items():
+                if key not in cls.FIELD_SET or value is None:
+                    task[key] = value
+        return task
+
+    def to_dict(self):
+        fields = {'text': self.text, 'completed': self.completed, 'priority': self.priority, 'id': self.id}
+        if self.extra or None in fields.values():
+            return {key: self[key] for key in self.keys()}
+        return fields
+
+    def __getitem__(self, key):
+        if key in self.FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self.FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def __setitem__(self, key, value):
+        if key in self.FIELD_SET and value is not None:
+            setattr(self, key, sys.intern(value) if key == 'priority' and type(value) is str else value)
+            if self.extra and key in self.extra:
+                del self.extra[key]
+            return
+        if key in self.FIELD_SET:
+            setattr(self, key, None)
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in self.FIELD_SET and getattr(self, key) is not None:
+            return True
+        return bool(self.extra) and key in self.extra
+
+    def keys(self):
+        keys = [key for key in self.FIELDS if getattr(self, key) is not None]
+        if self.extra:
+            keys.extend(key for key in self.extra if key not in keys)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, fields):
+        for key, value in dict(fields).items():
+            self[key] = value
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return f"Task({self.to_dict()!r})"
+
+def task_hook(fields):
+    # json object_hook: the usual four-field task object becomes a Task as it
+    # is parsed, which costs far less than converting the dicts afterwards
+    if len(fields) == 4:
+        try:
+            text, completed, priority, task_id = fields['text'], fields['completed'], fields['priority'], fields['id']
+        except KeyError:
+            return fields
+        # an explicit null stays a dict, for from_dict to carry over
+        if text is not None and completed is not None and priority is not None and task_id is not None:
+            return Task(text, completed, priority, task_id)
+    return fields
+
+def encode_task(obj):
+    # json.dumps default= hook, so tasks serialize exactly like their dicts did
+    if isinstance(obj, Task):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def ensure_task_ids(data):
+    # loaded tasks are all Task records, so the ids are read off the slots
+    ids = [task.id for task in data['tasks']]
+    next_id = max([task_id for task_id in ids if task_id is not None] + [data.get('next_task_id', 1) - 1]) + 1
+    if None in ids:
+        for task in data['tasks']:
+            if task.id is None:
+                task['id'] = next_id
+                next_id += 1
+    data['next_task_id'] = next_id
+
+def append_task(data, task, by_id):
+    # records replayed from a journal carry plain dicts
+    task = Task.from_dict(task)
+    if 'id' not in task:
+        task['id'] = data['next_task_id']
+    data['next_task_id'] = max(data['next_task_id'], task['id'] + 1)
+    data['tasks'].append(task)
+    by_id[task['id']] = task
+
+def apply_record(data, record, by_id=None):
+    # records written before tasks had ids address them by list position
+    op = record['op']
+    if by_id is None and op.startswith('task_'):
+        by_id = {task['id']: task for task in data['tasks'] if 'id' in task}
+    if op == 'task_add':
+        append_task(data, record['task'], by_id)
+    elif op == 'task_add_batch':
+        for task in record['tasks']:
+            append_task(data, task, by_id)
+    elif op == 'task_update':
+        task = by_id[record['id']] if 'id' in record else data['tasks'][record['index']]
+        task.update(record['fields'])
+    elif op == 'task_delete':
+        if 'id' in record:
+            # tasks compare by identity, so remove() finds exactly this one
+            data['tasks'].remove(by_id.pop(record['id']))
+        else:
+            by_id.pop(data['tasks'].pop(record['index']).get('id'), None)
+    elif op == 'xp':
+        data['xp'] += record['delta']
+        data['level'] = max(data['level'], data['xp'] // 100 + 1)
+    elif op == 'settings':
+        data.update(record['values'])
+    elif op == 'event':
+        apply_event(data['rollups'], record['event'])
+
+def rollup_keys(day):
+    year, week, _ = day.isocalendar()
+    return {'daily': day.isoformat(), 'weekly': f"{year}-W{week:02d}", 'monthly': day.strftime('%Y-%m')}
+
+def apply_event(rollups, event):
+    day = datetime.fromtimestamp(event['ts']).date()
+    for period, key in rollup_keys(day).items():
+        bucket = rollups[period].setdefault(key, {'sessions': 0, 'minutes': 0, 'xp': 0, 'tasks': 0})
+        if event['type'] == 'session':
+            bucket['sessions'] += 1
+            bucket['minutes'] += event.get('minutes', 0)
+        elif event['type'] == 'xp':
+            bucket['xp'] += event['amount']
+            if event.get('reason') == 'task':
+                bucket['tasks'] += 1
+
+    if event['type'] == 'session':
+        streak = rollups['streak']
+        last = date.fromisoformat(streak['last_day']) if streak['last_day'] else None
+        if last != day:
+            streak['current'] = streak['current'] + 1 if last and (day - last).days == 1 else 1
+            streak['best'] = max(streak['best'], streak['current'])
+            streak['last_day'] = day.isoformat()
+
+def current_streak(rollups, today=None):
+    today = today or date.today()
+    streak = rollups['streak']
+    if not streak['last_day'] or (today - date.fromisoformat(streak['last_day'])).days > 1:
+        return 0
+    return streak['current']
+
+def rollup_series(rollups, period, count, today=None):
+    today = today or date.today()
+    days = []
+    for i in reversed(range(count)):
+        if period == 'daily':
+            days.append(today - timedelta(days=i))
+        elif period == 'weekly':
+            days.append(today - timedelta(weeks=i))
+        else:
+            month = today.year * 12 + today.month - 1 - i
+            days.append(date(month // 12, month % 12 + 1, 1))
+    empty = {'sessions': 0, 'minutes': 0, 'xp': 0, 'tasks': 0}
+    return [(day, rollups[period].get(rollup_keys(day)[period], empty)) for day in days]
+
+def merge_rollups(local, base, remote):
+    # bucket counts are additive: the remote totals plus what this instance
+    # added since base; the streak with the later day wins
+    streak = max(local['streak'], remote['streak'], key=lambda s: (s['last_day'] or '', s['current']))
+    merged = {'streak': {**streak, 'best': max(local['streak']['best'], remote['streak']['best'])}}
+    for period in ('daily', 'weekly', 'monthly'):
+        buckets = copy.deepcopy(remote[period])
+        for key, bucket in local[period].items():
+            before = base[period].get(key, {})
+            target = buckets.setdefault(key, {'sessions': 0, 'minutes': 0, 'xp': 0, 'tasks': 0})
+            for field, value in bucket.items():
+                target[field] = target.get(field, 0) + value - before.get(field, 0)
+        merged[period] = buckets
+    return merged
+
+def merge_settings(data, base, remote):
+    # three-way merge of everything but the tasks; returns the keys that changed
+    changed = []
+    for key, value in remote.items():
+        if key in ('tasks', 'generation') or key not in data:
+            continue
+        local = data[key]
+        if key in COUNTER_KEYS:
+            merged = value + local - base.get(key, 0)
+        elif key == 'rollups':
+            merged = merge_rollups(local, base.get('rollups', DataManager.default_data()['rollups']), value)
+        elif key in ('level', 'next_task_id'):
+            merged = max(value, local)
+        elif local == base.get(key):
+            merged = copy.deepcopy(value)
+        else:
+            continue
+        if merged != local:
+            data[key] = merged
+            changed.append(key)
+    level = max(data['level'], data['xp'] // 100 + 1)
+    if level != data['level']:
+        data['level'] = level
+        changed.append('level')
+    return changed
+
+class DataLockedError(Exception):
+    pass
+
+class FileLock:
+    # advisory lock on a sidecar file: flock on POSIX, msvcrt on Windows. The
+    # thread lock keeps this instance's own threads (writer, fetch) in turn
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.thread_lock = threading.Lock()
+
+    def acquire(self, blocking=True):
+        if not self.thread_lock.acquire(blocking):
+            return False
+        self.file = open(self.path, 'a+b')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except OSError:
+            self.file.close()
+            self.file = None
+            self.thread_lock.release()
+            if blocking:
+                raise
+            return False
+        return True
+
+    def release(self):
+        if self.file is None:
+            return
+        if os.name == 'nt':
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+        self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+def events_file_for(data_filename):
+    # the log sits next to the data it belongs to; the default data files keep
+    # the original zentask_events.jsonl name
+    stem = os.path.splitext(data_filename)[0]
+    if os.path.basename(stem) == os.path.splitext(DATA_FILE)[0]:
+        return os.path.join(os.path.dirname(stem), EVENTS_FILE)
+    return stem + '.events.jsonl'
+
+class EventStore:
+    # lines are appended by a write-behind thread, so recording an event never
+    # waits on the disk
+    def __init__(self, filename=EVENTS_FILE, interval=JOURNAL_FLUSH_INTERVAL):
+        self.filename = filename
+        self.interval = interval
+        self.file = None
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopping = threading.Event()
+        self.writer = None
+
+    def append(self, event):
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        with self.lock:
+            self.buffer.append(line)
+            self.dirty.set()
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.run_writer, name='zentask-events', daemon=True)
+                self.writer.start()
+
+    def run_writer(self):
+        while not self.stopping.is_set():
+            self.dirty.wait()
+            self.stopping.wait(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                lines, self.buffer = self.buffer, []
+                self.dirty.clear()
+            if not lines:
+                return
+            try:
+                if self.file is None:
+                    self.file = open(self.filename, 'a')
+                self.file.write(''.join(lines))
+                self.file.flush()
+            except (IOError, OSError) as e:
+                print(f"Error writing event: {e}")
+
+    def __iter__(self):
+        self.flush()
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def rebuild(self):
+        rollups = DataManager.default_data()['rollups']
+        for event in self:
+            apply_event(rollups, event)
+        return rollups
+
+    def close(self):
+        self.stopping.set()
+        self.dirty.set()
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class DataManager:
+    paged = False
+
+    def __init__(self, filename=DATA_FILE, write_behind=False, interval=SAVE_INTERVAL):
+        self.filename = filename
+        self.write_behind = write_behind
+        self.interval = interval
+        self.pending = None
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopping = threading.Event()
+        self.writer = None
+        self.by_id = {}
+        # multi-instance state: what was on disk when we last read or wrote it
+        # (generation, stat signature, non-task values) and the task changes
+        # made here since, which a merge must not let the disk copy undo
+        self.file_lock = FileLock(filename + '.lock')
+        self.generation = 0
+        self.signature = None
+        self.base = {}
+        self.unsynced = self.new_unsynced()
+        self.fetcher = None
+        self.fetched = None
+
+    @staticmethod
+    def new_unsynced():
+        return {'added': set(), 'updated': {}, 'deleted': set()}
+
+    def save_data(self, data):
+        # returns what was merged in from another instance's save, if anything
+        if not self.write_behind:
+            with self.write_lock:
+                return self.write_merged(data, indent=4)
+        with self.lock:
+            self.pending = data
+            self.dirty.set()
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.run_writer, name='zentask-writer', daemon=True)
+            self.writer.start()
+
+    def commit(self, data, record):
+        with self.lock:
+            apply_record(data, record, self.by_id)
+            self.track(record)
+
+    def track(self, record):
+        op = record['op']
+        if op == 'task_add':
+            self.unsynced['added'].add(record['task']['id'])
+        elif op == 'task_add_batch':
+            self.unsynced['added'].update(task['id'] for task in record['tasks'])
+        elif op == 'task_update':
+            self.unsynced['updated'].setdefault(record['id'], set()).update(record['fields'])
+        elif op == 'task_delete':
+            self.unsynced['deleted'].add(record['id'])
+
+    def add_task(self, data, task):
+        self.commit(data, {'op': 'task_add', 'task': task})
+
+    def add_tasks(self, data, tasks):
+        # one record for the whole batch: a single journal line, a single save.
+        # Returns the committed tasks, which a merge during the batch may have
+        # moved within data['tasks']
+        tasks = list(tasks)
+        if tasks:
+            self.commit(data, {'op': 'task_add_batch', 'tasks': tasks})
+        return tasks
+
+    def update_task(self, data, task, fields):
+        self.commit(data, {'op': 'task_update', 'id': task['id'], 'fields': fields})
+
+    def delete_task(self, data, task):
+        self.commit(data, {'op': 'task_delete', 'id': task['id']})
+
+    def get_task(self, task_id):
+        return self.by_id.get(task_id)
+
+    def add_xp(self, data, amount):
+        self.commit(data, {'op': 'xp', 'delta': amount})
+
+    def record_event(self, data, event):
+        self.commit(data, {'op': 'event', 'event': event})
+
+    def run_writer(self):
+        while not self.stopping.is_set():
+            self.dirty.wait()
+            # let a burst of mutations settle into a single write
+            self.stopping.wait(self.interval)
+            self.write_pending()
+
+    def write_pending(self):
+        with self.write_lock:
+            with self.lock:
+                data, self.pending = self.pending, None
+                self.dirty.clear()
+            if data is None:
+                return
+            if not self.write_data(data):
+                # another instance saved first; sync() merges its copy and
+                # wakes the writer again
+                with self.lock:
+                    if self.pending is None:
+                        self.pending = data
+
+    def disk_signature(self):
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def write_data(self, data, indent=None):
+        # returns False when the file changed since we last saw it
+        with self.file_lock:
+            if self.disk_signature() != self.signature:
+                return False
+            with self.lock:
+                data['generation'] = self.generation + 1
+                try:
+                    # commits wait on self.lock, so this is a consistent snapshot
+                    payload = self.dump_data(data, indent)
+                except RuntimeError:
+                    data['generation'] = self.generation
+                    if self.pending is None:
+                        self.pending = data
+                    self.dirty.set()
+                    return True
+                unsynced, self.unsynced = self.unsynced, self.new_unsynced()
+                base = {k: copy.deepcopy(v) for k, v in data.items() if k != 'tasks'}
+            if not self.write_file(payload):
+                with self.lock:
+                    for key in ('added', 'deleted'):
+                        self.unsynced[key] |= unsynced[key]
+                    for task_id, fields in unsynced['updated'].items():
+                        self.unsynced['updated'].setdefault(task_id, set()).update(fields)
+                return True
+            self.generation += 1
+            self.signature = self.disk_signature()
+            self.base = base
+        return True
+
+    def dump_data(self, data, indent=None):
+        # plain dicts go through the encoder faster than a default= hook per task
+        data = {**data, 'tasks': [task.to_dict() for task in data['tasks']]}
+        return json.dumps(data, indent=indent, separators=None if indent else (',', ':'))
+
+    def write_merged(self, data, indent=None):
+        changes = None
+        while not self.write_data(data, indent):
+            merged = self.pull(data)
+            if merged is not None:
+                changes = merged if changes is None else self.combine(changes, merged)
+        return changes
+
+    @staticmethod
+    def combine(first, second):
+        # one merge can add a task that the next deletes, so two in a row are
+        # reported as a reload rather than as lists of task changes
+        settings = first['settings'] + [key for key in second['settings'] if key not in first['settings']]
+        return {'reload': True, 'added': [], 'updated': [], 'deleted': [], 'renumbered': [], 'settings': settings}
+
+    def sync(self, data):
+        # cheap when nothing changed: one stat() call. A changed file is read
+        # and parsed on a fetch thread, so the caller never waits on the disk;
+        # a later call merges what it read, unless the file moved on since
+        signature = self.disk_signature()
+        fetched = self.fetched
+        if fetched is not None and fetched[1] == signature:
+            if not self.write_lock.acquire(blocking=False):
+                return None
+            try:
+                self.fetched = None
+                return self.merge_remote(data, *fetched)
+            finally:
+                self.write_lock.release()
+        self.fetched = None
+        if signature != self.signature and (self.fetcher is None or not self.fetcher.is_alive()):
+            self.fetcher = threading.Thread(target=self.fetch, name='zentask-fetch', daemon=True)
+            self.fetcher.start()
+        return None
+
+    def fetch(self):
+        with self.file_lock:
+            remote = self.read_file()
+            signature = self.disk_signature()
+        self.fetched = (remote, signature)
+
+    def pull(self, data):
+        with self.file_lock:
+            remote = self.read_file()
+            signature = self.disk_signature()
+        return self.merge_remote(data, remote, signature)
+
+    def merge_remote(self, data, remote, signature):
+        self.signature = signature
+        if remote.get('generation', 0) <= self.generation:
+            return None
+        ensure_task_ids(remote)
+        with self.lock:
+            changes = self.merge(data, remote)
+            self.generation = remote['generation']
+            self.base = {k: copy.deepcopy(v) for k, v in remote.items() if k != 'tasks'}
+            if self.pending is not None:
+                self.dirty.set()
+        return changes if any(changes.values()) else None
+
+    def merge(self, data, remote):
+        # fold another instance's saved state into ours, touching only the tasks
+        # and values that differ; our unsynced task changes win over theirs
+        changes = {'added': [], 'updated': [], 'deleted': [], 'renumbered': []}
+        unsynced = self.unsynced
+        remote_by_id = {task.id: task for task in remote['tasks']}
+        next_id = max(data['next_task_id'], remote['next_task_id'])
+        for task_id, task in remote_by_id.items():
+            local = self.by_id.get(task_id)
+            if local is not None and task_id in unsynced['added']:
+                # both instances handed out this id; ours moves to a fresh one
+                del self.by_id[task_id]
+                local['id'] = next_id
+                self.by_id[next_id] = local
+                unsynced['added'].discard(task_id)
+                unsynced['added'].add(next_id)
+                changes['renumbered'].append(local)
+                next_id += 1
+                local = None
+            if local is None:
+                if task_id not in unsynced['deleted']:
+                    data['tasks'].append(task)
+                    self.by_id[task_id] = task
+                    changes['added'].append(task)
+                continue
+            kept = unsynced['updated'].get(task_id, ())
+            fields = {k: v for k, v in task.items() if k not in kept and local.get(k) != v}
+            if fields:
+                changes['updated'].append((local, dict(local)))
+                local.update(fields)
+        gone = {task_id for task_id in self.by_id if task_id not in remote_by_id and task_id not in unsynced['added']}
+        if gone:
+            changes['deleted'] = [self.by_id.pop(task_id) for task_id in gone]
+            data['tasks'][:] = [task for task in data['tasks'] if task['id'] not in gone]
+        data['next_task_id'] = next_id
+        changes['settings'] = merge_settings(data, self.base, remote)
+        return changes
+
+    def write_file(self, payload):
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.zentask-', suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'wb' if isinstance(payload, bytes) else 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filename)
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error saving data: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def flush(self):
+        if self.write_behind:
+            self.write_pending()
+
+    def close(self):
+        self.stopping.set()
+        self.dirty.set()
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+        self.flush()
+        with self.write_lock:
+            data = self.pending
+            self.pending = None
+            return None if data is None else self.write_merged(data)
+
+    @staticmethod
+    def default_data():
+        return {
+            'tasks': [],
+            'timer_settings': {'mode': 'Focus', 'seconds': 25 * 60},
+            'custom_timer_settings': {'focus_time': 25, 'short_break_time': 5, 'long_break_time': 15},
+            'pomodoro_cycle': 0,
+            'current_filter': 'All',
+            'current_sort_order': 'None',
+            'completed_focus_sessions': 0,
+            'total_focus_time': 0,
+            'current_theme': 'dark',
+            'xp': 0,
+            'level': 1,
+            'next_task_id': 1,
+            'rollups': {'daily': {}, 'weekly': {}, 'monthly': {}, 'streak': {'current': 0, 'best': 0, 'last_day': None}}
+        }
+
+    def load_data(self):
+        with self.file_lock:
+            data = self.read_file()
+            self.signature = self.disk_signature()
+        ensure_task_ids(data)
+        self.by_id = {task.id: task for task in data['tasks']}
+        self.generation = data.get('generation', 0)
+        self.base = {k: copy.deepcopy(v) for k, v in data.items() if k != 'tasks'}
+        return data
+
+    def read_file(self):
+        default_data = self.default_data()
+        if not os.path.exists(self.filename):
+            return default_data
+        try:
+            data = self.read_data()
+        except (IOError, ValueError):
+            return default_data
+        for key, value in default_data.items():
+            if key not in data:
+                data[key] = value
+        return data
+
+    def read_data(self):
+        with open(self.filename, 'r') as f:
+            data = json.load(f, object_hook=task_hook)
+        data['tasks'] = [task if type(task) is Task else Task.from_dict(task) for task in data.get('tasks', ())]
+        return data
+
+class JournalDataManager(DataManager):
+    SETTINGS_EXCLUDE = ('tasks', 'xp', 'level', 'rollups', 'generation')
+
+    def __init__(self, filename=DATA_FILE, interval=JOURNAL_FLUSH_INTERVAL, compact_interval=JOURNAL_COMPACT_INTERVAL):
+        super().__init__(filename, interval=interval)
+        self.compact_interval = compact_interval
+        self.data = None
+        self.settings = {}
+        self.generation = 0
+        self.buffer = []
+        self.records_since_snapshot = 0
+        self.journal_file = None
+        self.journal_gen = None
+        self.instance_lock = FileLock(filename + '.journal.lock')
+
+    def journal_path(self, generation):
+        return f"{self.filename}.journal.{generation}"
+
+    def journal_generations(self):
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        prefix = os.path.basename(self.filename) + '.journal.'
+        gens = [name[len(prefix):] for name in os.listdir(directory) if name.startswith(prefix)]
+        return sorted(int(g) for g in gens if g.isdigit())
+
+    @staticmethod
+    def encode(record):
+        body = json.dumps(record, separators=(',', ':'), default=encode_task)
+        return f"{zlib.crc32(body.encode()):08x} {body}\n".encode()
+
+    @staticmethod
+    def decode(line):
+        if not line.endswith(b'\n'):
+            return None
+        crc, _, body = line[:-1].partition(b' ')
+        try:
+            if int(crc, 16) != zlib.crc32(body):
+                return None
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    def load_data(self):
+        # snapshot generations assume a single writer, so a second instance is
+        # refused rather than left to drop the first one's records on compaction
+        if self.instance_lock.file is None and not self.instance_lock.acquire(blocking=False):
+            raise DataLockedError(f"{self.filename} is open in another ZenTask instance; "
+                                  "use the json or sqlite storage engine to share data between instances")
+        # a plain zentask_data.json is a valid snapshot with no journal yet,
+        # so existing data files migrate without a conversion step
+        data = super().load_data()
+        self.generation = data.pop('journal_generation', 0)
+        for gen in self.journal_generations():
+            if gen < self.generation:
+                os.remove(self.journal_path(gen))
+                continue
+            self.replay(data, gen)
+            self.generation = gen
+        self.data = data
+        self.settings = {k: copy.deepcopy(v) for k, v in data.items() if k not in self.SETTINGS_EXCLUDE}
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.run_writer, name='zentask-journal', daemon=True)
+            self.writer.start()
+        return data
+
+    def replay(self, data, generation):
+        path = self.journal_path(generation)
+        good = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                record = self.decode(line)
+                if record is None:
+                    break
+                apply_record(data, record, self.by_id)
+                good += len(line)
+                self.records_since_snapshot += 1
+        if good < os.path.getsize(path):
+            # drop the torn tail left by a crash so new records follow valid ones
+            with open(path, 'r+b') as f:
+                f.truncate(good)
+
+    def commit(self, data, record):
+        with self.lock:
+            apply_record(data, record, self.by_id)
+            self.buffer.append(self.encode(record))
+            self.records_since_snapshot += 1
+
+    def sync(self, data):
+        return None
+
+    def save_data(self, data):
+        changed = {k: copy.deepcopy(v) for k, v in data.items()
+                   if k not in self.SETTINGS_EXCLUDE and self.settings.get(k) != v}
+        if changed:
+            self.settings.update(changed)
+            self.commit(data, {'op': 'settings', 'values': changed})
+
+    def run_writer(self):
+        last_compact = time.monotonic()
+        while not self.stopping.is_set():
+            self.stopping.wait(self.interval)
+            self.write_pending()
+            if time.monotonic() - last_compact >= self.compact_interval:
+                self.compact()
+                last_compact = time.monotonic()
+
+    def write_pending(self):
+        with self.write_lock:
+            with self.lock:
+                lines, self.buffer = self.buffer, []
+                generation = self.generation
+            self.append_lines(generation, lines)
+
+    def append_lines(self, generation, lines):
+        if not lines:
+            return
+        try:
+            if self.journal_gen != generation:
+                if self.journal_file is not None:
+                    self.journal_file.close()
+                self.journal_file = open(self.journal_path(generation), 'ab')
+                self.journal_gen = generation
+            self.journal_file.write(b''.join(lines))
+            self.journal_file.flush()
+            os.fsync(self.journal_file.fileno())
+        except (IOError, OSError) as e:
+            print(f"Error writing journal: {e}")
+
+    def compact(self):
+        with self.write_lock:
+            with self.lock:
+                if self.data is None or not self.records_since_snapshot:
+                    return
+                lines, self.buffer = self.buffer, []
+                old_gen = self.generation
+                self.generation += 1
+                self.records_since_snapshot = 0
+                payload = self.dump_data({**self.data, 'journal_generation': self.generation})
+            # records appended from here on go to the new generation; the old
+            # journal is only dropped once the snapshot covering it is durable
+            self.append_lines(old_gen, lines)
+            if not self.write_file(payload):
+                return
+            if self.journal_file is not None:
+                self.journal_file.close()
+                self.journal_file = None
+                self.journal_gen = None
+            for gen in self.journal_generations():
+                if gen < self.generation:
+                    os.remove(self.journal_path(gen))
+
+    def flush(self):
+        self.write_pending()
+
+    def close(self):
+        self.stopping.set()
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+        self.write_pending()
+        self.compact()
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+        self.instance_lock.release()
+
+def pack_data(data):
+    # binary layout, little-endian, each section right after the one before:
+    #   header      magic, version, flags, task count, meta and string table sizes
+    #   meta        JSON: every value but the tasks, the priority names, and any
+    #               task field the columns cannot hold, by task position
+    #   offsets     u32 per task: where its entry starts in the string table
+    #   strings     per task: u32 byte length, then the UTF-8 text
+    #   ids         i64 per task (-1: no id)
+    #   priorities  u8 per task: index into the meta priority names (255: none)
+    #   completed   one bit per task
+    tasks = data['tasks']
+    count = len(tasks)
+    names, codes, extras = [], {}, {}
+    offsets, ids = array('I'), array('q')
+    priorities = bytearray(count)
+    completed = bytearray((count + 7) // 8)
+    strings = []
+    size = 0
+    for i, task in enumerate(tasks):
+        task = Task.from_dict(task)
+        extra = dict(task.extra) if task.extra else {}
+        text = task.text
+        if type(text) is not str:
+            extra['text'] = text
+            text = ''
+        raw = text.encode()
+        offsets.append(size)
+        strings.append(len(raw).to_bytes(4, 'little'))
+        strings.append(raw)
+        size += 4 + len(raw)
+        ids.append(-1 if task.id is None else task.id)
+        priority = task.priority
+        if type(priority) is str:
+            code = codes.get(priority)
+            if code is None:
+                if len(names) == NO_PRIORITY:
+                    raise ValueError("too many distinct priorities for the binary format")
+                code = codes[priority] = len(names)
+                names.append(priority)
+            priorities[i] = code
+        else:
+            if priority is not None:
+                extra['priority'] = priority
+            priorities[i] = NO_PRIORITY
+        if task.completed is True:
+            completed[i >> 3] |= 1 << (i & 7)
+        elif task.completed is not False:
+            extra['completed'] = task.completed
+        if extra:
+            extras[str(i)] = extra
+    if size > 0xFFFFFFFF:
+        raise ValueError("task text too large for the binary format")
+    meta = json.dumps({'data': {k: v for k, v in data.items() if k != 'tasks'}, 'priorities': names, 'extras': extras},
+                      separators=(',', ':')).encode()
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+        ids.byteswap()
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, count, len(meta), size)
+    return b''.join([header, meta, offsets.tobytes(), *strings, ids.tobytes(), priorities, completed])
+
+class TaskFile:
+    # a binary data file mapped read-only. Opening it reads only the header and
+    # meta; tasks are decoded one at a time on access, or in bulk by load()
+    BITS = [tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256)]
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.parse()
+        except ValueError:
+            self.buf.close()
+            raise
+
+    def parse(self):
+        if len(self.buf) < BINARY_HEADER.size:
+            raise ValueError("binary data file is truncated")
+        magic, version, _, count, meta_size, strings_size = BINARY_HEADER.unpack_from(self.buf)
+        if magic != BINARY_MAGIC:
+            raise ValueError("not a ZenTask binary data file")
+        if version > BINARY_VERSION:
+            raise ValueError(f"binary data format {version} is newer than this version of ZenTask reads")
+        pos = BINARY_HEADER.size
+        self.count = count
+        self.meta = json.loads(self.buf[pos:pos + meta_size])
+        self.names = [sys.intern(name) for name in self.meta['priorities']]
+        self.names += [None] * (256 - len(self.names))
+        self.offsets_at = pos = pos + meta_size
+        self.strings_at = pos = pos + 4 * count
+        self.ids_at = pos = pos + strings_size
+        self.priorities_at = pos = pos + 8 * count
+        self.completed_at = pos = pos + count
+        if pos + (count + 7) // 8 > len(self.buf):
+            raise ValueError("binary data file is truncated")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        buf = self.buf
+        start = self.strings_at + struct.unpack_from('<I', buf, self.offsets_at + 4 * i)[0]
+        size = struct.unpack_from('<I', buf, start)[0]
+        task_id = struct.unpack_from('<q', buf, self.ids_at + 8 * i)[0]
+        task = Task(buf[start + 4:start + 4 + size].decode(), self.BITS[buf[self.completed_at + (i >> 3)]][i & 7],
+                    self.names[buf[self.priorities_at + i]], None if task_id < 0 else task_id)
+        task.update(self.meta['extras'].get(str(i), ()))
+        return task
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def tasks(self):
+        buf = self.buf
+        offsets, ids = array('I'), array('q')
+        offsets.frombytes(buf[self.offsets_at:self.strings_at])
+        ids.frombytes(buf[self.ids_at:self.priorities_at])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+            ids.byteswap()
+        strings = buf[self.strings_at:self.ids_at]
+        # each entry ends where the next one's length prefix starts
+        ends = offsets[1:]
+        ends.append(len(strings))
+        completed = chain.from_iterable(self.BITS[byte] for byte in buf[self.completed_at:self.completed_at + (self.count + 7) // 8])
+        names = self.names
+        tasks = [Task(strings[start + 4:end].decode(), done, names[code], None if task_id < 0 else task_id)
+                 for start, end, done, code, task_id in zip(offsets, ends, completed, buf[self.priorities_at:self.completed_at], ids)]
+        for i, fields in self.meta['extras'].items():
+            tasks[int(i)].update(fields)
+        return tasks
+
+    def load(self):
+        data = self.meta['data']
+        data['tasks'] = self.tasks()
+        return data
+
+    def close(self):
+        self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class BinaryDataManager(DataManager):
+    # the json engine's saving and merging over the compact binary layout,
+    # which loads without a JSON parse of every task
+    def __init__(self, filename=BINARY_FILE, json_filename=DATA_FILE, write_behind=False, interval=SAVE_INTERVAL):
+        super().__init__(filename, write_behind, interval)
+        self.json_filename = json_filename
+
+    def dump_data(self, data, indent=None):
+        return pack_data(data)
+
+    def read_file(self):
+        # until the first save, an existing zentask_data.json is read as is
+        if not os.path.exists(self.filename) and os.path.exists(self.json_filename):
+            return DataManager(self.json_filename).read_file()
+        return super().read_file()
+
+    def read_data(self):
+        with TaskFile(self.filename) as f:
+            return f.load()
+
+class TaskQuery:
+    PAGE_SIZE = 256
+    MAX_PAGES = 8
+
+    def __init__(self, conn, where='', params=(), order='id'):
+        self.conn = conn
+        self.where = f" WHERE {where}" if where else ''
+        self.params = tuple(params)
+        self.order = order
+        self.count = None
+        self.pages = {}
+
+    @staticmethod
+    def row_to_task(row):
+        return {'id': row[0], 'text': row[1], 'completed': bool(row[2]), 'priority': row[3]}
+
+    def sql(self):
+        return f"SELECT id, text, completed, priority FROM tasks{self.where} ORDER BY {self.order}"
+
+    def __len__(self):
+        if self.count is None:
+            self.count = self.conn.execute(f"SELECT COUNT(*) FROM tasks{self.where}", self.params).fetchone()[0]
+        return self.count
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError(pos)
+        page_no, offset = divmod(pos, self.PAGE_SIZE)
+        page = self.pages.pop(page_no, None)
+        if page is None:
+            rows = self.conn.execute(f"{self.sql()} LIMIT ? OFFSET ?",
+                                     (*self.params, self.PAGE_SIZE, page_no * self.PAGE_SIZE))
+            page = [self.row_to_task(row) for row in rows]
+            if len(self.pages) >= self.MAX_PAGES:
+                del self.pages[next(iter(self.pages))]
+        # re-inserting keeps self.pages in least-recently-used order
+        self.pages[page_no] = page
+        return page[offset]
+
+    def __iter__(self):
+        for row in self.conn.execute(self.sql(), self.params):
+            yield self.row_to_task(row)
+
+    def invalidate(self):
+        self.count = None
+        self.pages.clear()
+
+class SQLiteDataManager(DataManager):
+    paged = True
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            text TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            priority TEXT NOT NULL DEFAULT 'Medium',
+            prio_rank INTEGER NOT NULL DEFAULT 2
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (prio_rank DESC, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_priority ON tasks (completed, prio_rank DESC, id);
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    FILTERS = {'All': '', 'Completed': 'completed = 1', 'Pending': 'completed = 0'}
+    ORDERS = {'None': 'id', 'Priority': 'prio_rank DESC, id'}
+
+    def __init__(self, filename=SQLITE_FILE, json_filename=DATA_FILE):
+        super().__init__(filename)
+        self.json_filename = json_filename
+        self.conn = None
+        self.settings = {}
+        self.queries = weakref.WeakSet()
+        self.data_version = None
+
+    def connect(self):
+        import sqlite3
+        conn = sqlite3.connect(self.filename)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    @staticmethod
+    def task_row(task):
+        priority = task.get('priority', 'Medium')
+        return (task.get('id'), task['text'], int(bool(task.get('completed'))), priority, PRIORITY_RANK.get(priority, 1))
+
+    def load_data(self):
+        if self.conn is None:
+            self.conn = self.connect()
+        self.migrate(self.conn)
+        rows = self.conn.execute('SELECT key, value FROM settings').fetchall()
+        data = self.default_data()
+        for key, value in rows:
+            data[key] = json.loads(value)
+        self.settings = {k: copy.deepcopy(v) for k, v in data.items() if k != 'tasks'}
+        self.data_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        data['tasks'] = self.query_tasks('All', 'None')
+        return data
+
+    def prepare(self):
+        # the one slow step of loading, a first-run import of the JSON file, on
+        # a connection of its own: this may run on a loader thread, while the
+        # connection load_data() opens stays with the thread that uses it
+        conn = self.connect()
+        try:
+            self.migrate(conn)
+        finally:
+            conn.close()
+
+    def migrate(self, conn):
+        if conn.execute('SELECT 1 FROM settings LIMIT 1').fetchone() or not os.path.exists(self.json_filename):
+            return
+        source = DataManager(self.json_filename).load_data()
+        with conn:
+            conn.executemany('INSERT INTO tasks (id, text, completed, priority, prio_rank) VALUES (?, ?, ?, ?, ?)',
+                             (self.task_row(task) for task in source.pop('tasks')))
+            conn.executemany('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+                             ((key, json.dumps(value)) for key, value in source.items()))
+
+    def where(self, filter_val, search=''):
+        clauses = [self.FILTERS.get(filter_val, '')]
+        params = []
+        # no full-text index here: search terms become substring LIKE filters
+        for term in TaskIndex.terms(search):
+            clauses.append("lower(text) LIKE ? ESCAPE '\\'")
+            params.append('%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        return ' AND '.join(c for c in clauses if c), params
+
+    def query_tasks(self, filter_val, sort_val, search=''):
+        where, params = self.where(filter_val, search)
+        query = TaskQuery(self.conn, where, params, self.ORDERS.get(sort_val, 'id'))
+        self.queries.add(query)
+        return query
+
+    def get_task(self, task_id):
+        row = self.conn.execute('SELECT id, text, completed, priority FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        return TaskQuery.row_to_task(row) if row else None
+
+    def invalidate(self):
+        for query in list(self.queries):
+            query.invalidate()
+
+    def commit(self, data, record):
+        op = record['op']
+        if op == 'task_add':
+            task = record['task']
+            with self.conn:
+                task['id'] = self.conn.execute('INSERT INTO tasks (id, text, completed, priority, prio_rank) VALUES (?, ?, ?, ?, ?)',
+                                               self.task_row(task)).lastrowid
+        elif op == 'task_update':
+            fields = dict(record['fields'])
+            columns = {k: fields[k] for k in ('text', 'completed', 'priority') if k in fields}
+            if 'completed' in columns:
+                columns['completed'] = int(bool(columns['completed']))
+            if 'priority' in columns:
+                columns['prio_rank'] = PRIORITY_RANK.get(columns['priority'], 1)
+            if not columns:
+                return
+            assignments = ', '.join(f"{k} = ?" for k in columns)
+            with self.conn:
+                self.conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*columns.values(), record['id']))
+        elif op == 'task_delete':
+            with self.conn:
+                self.conn.execute('DELETE FROM tasks WHERE id = ?', (record['id'],))
+        else:
+            apply_record(data, record, self.by_id)
+            return
+        self.invalidate()
+
+    def add_tasks(self, data, tasks):
+        # streamed in chunks inside one transaction, so a failed or cancelled
+        # import rolls back as a whole without holding every row in memory
+        with self.conn:
+            first_id = next_id = self.conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM tasks').fetchone()[0]
+            tasks = iter(tasks)
+            while True:
+                chunk = list(islice(tasks, IMPORT_CHUNK))
+                if not chunk:
+                    break
+                for task in chunk:
+                    task['id'] = next_id
+                    next_id += 1
+                self.conn.executemany('INSERT INTO tasks (id, text, completed, priority, prio_rank) VALUES (?, ?, ?, ?, ?)',
+                                      [self.task_row(task) for task in chunk])
+        self.invalidate()
+        # the inserted rows, paged back in on demand like any other query
+        return TaskQuery(self.conn, 'id >= ? AND id < ?', (first_id, next_id))
+
+    def update_task(self, data, task, fields):
+        task.update(fields)
+        self.commit(data, {'op': 'task_update', 'id': task['id'], 'fields': fields})
+
+    def read_settings(self):
+        return {key: json.loads(value) for key, value in self.conn.execute('SELECT key, value FROM settings')}
+
+    def save_data(self, data):
+        if not any(k != 'tasks' and self.settings.get(k) != v for k, v in data.items()):
+            return
+        with self.conn:
+            # counters are merged against whatever another instance stored
+            # since we last read them, inside one write transaction
+            self.conn.execute('BEGIN IMMEDIATE')
+            merge_settings(data, self.settings, self.read_settings())
+            changed = {k: copy.deepcopy(v) for k, v in data.items() if k != 'tasks' and self.settings.get(k) != v}
+            self.conn.executemany('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+                                  ((key, json.dumps(value)) for key, value in changed.items()))
+        self.settings.update(changed)
+
+    def sync(self, data):
+        # data_version only moves when another connection commits
+        version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        if version == self.data_version:
+            return None
+        self.data_version = version
+        self.invalidate()
+        remote = self.read_settings()
+        changed = merge_settings(data, self.settings, remote)
+        self.settings.update(copy.deepcopy(remote))
+        return {'reload': True, 'added': [], 'updated': [], 'deleted': [], 'renumbered': [], 'settings': changed}
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+def create_data_manager(engine=None, filename=None, write_behind=True):
+    engine = engine or os.environ.get('ZENTASK_STORAGE', 'json')
+    if engine == 'journal':
+        return JournalDataManager(filename or DATA_FILE)
+    if engine == 'sqlite':
+        return SQLiteDataManager(filename or SQLITE_FILE)
+    if engine == 'binary':
+        return BinaryDataManager(filename or BINARY_FILE, write_behind=write_behind)
+    return DataManager(filename or DATA_FILE, write_behind=write_behind)
+
+class CountdownTimer:
+    def __init__(self, seconds, clock=time.monotonic):
+        self.clock = clock
+        self.duration = seconds
+        self.paused_remaining = seconds
+        self.deadline = None
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def start(self):
+        if self.running or self.paused_remaining <= 0:
+            return False
+        self.deadline = self.clock() + self.paused_remaining
+        return True
+
+    def pause(self):
+        if self.running:
+            self.paused_remaining = self.remaining()
+            self.deadline = None
+
+    def reset(self, seconds):
+        self.deadline = None
+        self.duration = seconds
+        self.paused_remaining = seconds
+
+    def progress(self, now=None):
+        if self.duration <= 0:
+            return 0.0
+        return 1.0 - self.remaining(now) / self.duration
+
+    def remaining(self, now=None):
+        if self.deadline is None:
+            return self.paused_remaining
+        return max(0.0, self.deadline - (self.clock() if now is None else now))
+
+    def seconds_left(self, now=None):
+        return math.ceil(self.remaining(now))
+
+    def next_boundary(self, now):
+        # monotonic time at which seconds_left() next drops by one
+        if self.deadline is None:
+            return None
+        left = self.deadline - now
+        frac = left - math.floor(left)
+        return now + (frac if frac > 0 else 1.0)
+
+def synthesize_cue(tones, rate=AUDIO_RATE, volume=0.5):
+    import wave
+    samples = array('h')
+    for freq, duration in tones:
+        n = int(rate * duration)
+        fade = min(n // 2, int(rate * 0.01)) or 1
+        step = 2 * math.pi * freq / rate
+        for i in range(n):
+            # short linear fade in/out so the tone does not click
+            env = min(1.0, i / fade, (n - i) / fade)
+            samples.append(int(32767 * volume * env * math.sin(step * i)) if freq else 0)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+class NullSink:
+    def __init__(self):
+        self.played = []
+
+    def play(self, cue, wav):
+        self.played.append(cue)
+
+    def close(self):
+        pass
+
+class FileSink:
+    def __init__(self, directory):
+        self.directory = directory
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def play(self, cue, wav):
+        self.count += 1
+        with open(os.path.join(self.directory, f"{self.count:04d}-{cue}.wav"), 'wb') as f:
+            f.write(wav)
+
+    def close(self):
+        pass
+
+class WinsoundSink:
+    def play(self, cue, wav):
+        winsound.PlaySound(wav, winsound.SND_MEMORY)
+
+    def close(self):
+        pass
+
+class CommandSink:
+    def __init__(self, command):
+        self.command = command
+        self.paths = {}
+
+    def play(self, cue, wav):
+        path = self.paths.get(cue)
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix=f'zentask-{cue}-', suffix='.wav')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(wav)
+            self.paths[cue] = path
+        import subprocess
+        subprocess.run([*self.command, path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def close(self):
+        for path in self.paths.values():
+            if os.path.exists(path):
+                os.remove(path)
+        self.paths.clear()
+
+def default_sink():
+    choice = os.environ.get('ZENTASK_AUDIO', 'auto')
+    if choice == 'null':
+        return NullSink()
+    if choice.startswith('file:'):
+        return FileSink(choice[len('file:'):])
+    if platform.system() == 'Windows':
+        return WinsoundSink()
+    if sys.platform == 'darwin':
+        return CommandSink(['afplay'])
+    for command in (['paplay'], ['aplay', '-q'], ['play', '-q']):
+        if shutil.which(command[0]):
+            return CommandSink(command)
+    return NullSink()
+
+class AudioEngine:
+    def __init__(self, sink=None, maxsize=AUDIO_QUEUE_SIZE):
+        self.sink = sink if sink is not None else default_sink()
+        self.queue = queue.Queue(maxsize)
+        self.lock = threading.Lock()
+        self.queued = set()
+        self.cache = {}
+        self.dropped = 0
+        self.worker = threading.Thread(target=self.run, name='zentask-audio', daemon=True)
+        self.worker.start()
+
+    def play(self, cue):
+        with self.lock:
+            # a cue that is already waiting absorbs repeats from the same burst
+            if cue in self.queued:
+                return
+            try:
+                self.queue.put_nowait(cue)
+            except queue.Full:
+                self.dropped += 1
+                return
+            self.queued.add(cue)
+
+    def wav(self, cue):
+        if cue not in self.cache:
+            self.cache[cue] = synthesize_cue(SOUND_CUES.get(cue, SOUND_CUES['notification']))
+        return self.cache[cue]
+
+    def run(self):
+        for cue in SOUND_CUES:
+            self.wav(cue)
+        while True:
+            cue = self.queue.get()
+            if cue is None:
+                break
+            with self.lock:
+                self.queued.discard(cue)
+            try:
+                self.sink.play(cue, self.wav(cue))
+            except Exception as e:
+                print(f"Sound error: {e}")
+
+    def close(self, timeout=1.0):
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.worker.join(timeout)
+        self.sink.close()
+
+class Profiler:
+    def __init__(self, enabled=False, trace_size=PROFILE_TRACE_SIZE, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.stats = {}
+        self.trace = deque(maxlen=trace_size)
+        self.patched = []
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.environ.get('ZENTASK_PROFILE', '') not in ('', '0'))
+
+    def record(self, name, seconds):
+        # histogram buckets are powers of two in microseconds
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'buckets': [0] * 40}
+        entry['count'] += 1
+        entry['total'] += seconds
+        if seconds > entry['max']:
+            entry['max'] = seconds
+        entry['buckets'][min(int(seconds * 1e6).bit_length(), 39)] += 1
+        self.trace.append((time.time(), name, seconds))
+
+    def wrap(self, func, name):
+        def timed(*args, **kwargs):
+            start = self.clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, self.clock() - start)
+        timed.__wrapped__ = func
+        return timed
+
+    def instrument(self, obj, names, prefix=''):
+        for name in names:
+            if name in vars(obj):
+                continue
+            setattr(obj, name, self.wrap(getattr(obj, name), prefix + name))
+            self.patched.append((obj, name))
+
+    def uninstrument(self):
+        for obj, name in self.patched:
+            delattr(obj, name)
+        self.patched.clear()
+
+    @staticmethod
+    def percentile(buckets, count, fraction):
+        target = fraction * count
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if n and seen >= target:
+                return (1 << i) / 1e6
+        return 0.0
+
+    def snapshot(self):
+        return {name: {
+            'count': e['count'],
+            'mean_ms': round(e['total'] / e['count'] * 1000, 3),
+            'p50_ms': round(self.percentile(e['buckets'], e['count'], 0.5) * 1000, 3),
+            'p95_ms': round(self.percentile(e['buckets'], e['count'], 0.95) * 1000, 3),
+            'max_ms': round(e['max'] * 1000, 3),
+            'total_ms': round(e['total'] * 1000, 3),
+        } for name, e in sorted(self.stats.items())}
+
+    def reset(self):
+        self.stats.clear()
+        self.trace.clear()
+
+    def export_json(self, path, extra=None):
+        with open(path, 'w') as f:
+            json.dump({'summary': self.snapshot(), 'extra': extra or {},
+                       'trace': [{'ts': ts, 'name': name, 'ms': round(sec * 1000, 4)} for ts, name, sec in self.trace]},
+                      f, indent=2)
+
+    def export_csv(self, path):
+        import csv
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ts', 'name', 'ms'])
+            for ts, name, sec in self.trace:
+                writer.writerow([f"{ts:.6f}", name, f"{sec * 1000:.4f}"])
+
+class SimulatedClock:
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.now
+
+class TaskIndex:
+    def __init__(self, tasks):
+        self.by_id = {}
+        self.by_status = {True: set(), False: set()}
+        self.by_priority = {}
+        self.postings = {}
+        for task in tasks:
+            self.by_id[task['id']] = task
+            self.index_fields(task)
+            for token in self.tokenize(task['text']):
+                self.postings.setdefault(token, set()).add(task['id'])
+        # sorted vocabulary so a prefix maps to one contiguous bisect range
+        self.tokens = sorted(self.postings)
+
+    @staticmethod
+    def tokenize(text):
+        return set(re.findall(r'\w+', text.lower()))
+
+    @staticmethod
+    def terms(search):
+        return re.findall(r'\w+', search.lower())
+
+    @classmethod
+    def matches_search(cls, task, search):
+        tokens = cls.tokenize(task['text'])
+        return all(any(token.startswith(term) for token in tokens) for term in cls.terms(search))
+
+    def index_fields(self, task):
+        self.by_status[bool(task['completed'])].add(task['id'])
+        self.by_priority.setdefault(task.get('priority', 'Medium'), set()).add(task['id'])
+
+    def unindex_fields(self, task):
+        self.by_status[bool(task['completed'])].discard(task['id'])
+        self.by_priority.get(task.get('priority', 'Medium'), set()).discard(task['id'])
+
+    def index_text(self, task_id, text):
+        for token in self.tokenize(text):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.tokens, token)
+            ids.add(task_id)
+
+    def unindex_text(self, task_id, text):
+        for token in self.tokenize(text):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                del self.tokens[bisect.bisect_left(self.tokens, token)]
+
+    def add(self, task):
+        self.by_id[task['id']] = task
+        self.index_fields(task)
+        self.index_text(task['id'], task['text'])
+
+    def remove(self, task):
+        del self.by_id[task['id']]
+        self.unindex_fields(task)
+        self.unindex_text(task['id'], task['text'])
+
+    def update(self, task, old):
+        self.unindex_fields(old)
+        self.index_fields(task)
+        if old['text'] != task['text']:
+            self.unindex_text(task['id'], old['text'])
+            self.index_text(task['id'], task['text'])
+
+    def prefix_ids(self, prefix):
+        result = set()
+        i = bisect.bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            result |= self.postings[self.tokens[i]]
+            i += 1
+        return result
+
+    def ids(self, filter_val='All', search=''):
+        ids = None
+        if filter_val == 'Completed':
+            ids = self.by_status[True]
+        elif filter_val == 'Pending':
+            ids = self.by_status[False]
+        for term in self.terms(search):
+            matches = self.prefix_ids(term)
+            ids = matches if ids is None else matches & ids
+        return self.by_id.keys() if ids is None else ids
+
+    def sorted_ids(self, filter_val='All', sort_val='None', search=''):
+        # views come out of the index in order: by id, or bucket by bucket from
+        # High down to Low, so no task is ranked on its own
+        ids = self.ids(filter_val, search)
+        if sort_val != 'Priority':
+            return sorted(ids)
+        ranks = {}
+        for priority, bucket in self.by_priority.items():
+            ranks.setdefault(PRIORITY_RANK.get(priority, 1), []).append(bucket)
+        result = []
+        for rank in sorted(ranks, reverse=True):
+            bucket = set().union(*ranks[rank])
+            result.extend(sorted(bucket & ids if isinstance(ids, set) else bucket))
+        return result
+
+class ImportCancelled(Exception):
+    pass
+
+def read_task_rows(f, fmt):
+    # f is opened in binary mode so f.tell() stays usable for progress while
+    # rows are pulled one at a time
+    lines = (line.decode('utf-8-sig' if i == 0 else 'utf-8', errors='replace') for i, line in enumerate(f))
+    if fmt == 'csv':
+        import csv
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_no, line in enumerate(lines, 1):
+            if line.strip():
+                yield line_no, line
+
+def parse_task_row(row):
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise ValueError("expected an object")
+    text = str(row.get('text') or '').strip()
+    if not text:
+        raise ValueError("missing text")
+    completed = row.get('completed', False)
+    if not isinstance(completed, bool):
+        value = str(completed if completed is not None else '').strip().lower()
+        if value not in TRUE_VALUES + FALSE_VALUES:
+            raise ValueError(f"bad completed value {completed!r}")
+        completed = value in TRUE_VALUES
+    priority = str(row.get('priority') or 'Medium').strip().capitalize()
+    if priority not in PRIORITY_RANK:
+        raise ValueError(f"bad priority {row.get('priority')!r}")
+    return Task(text, completed, priority)
+
+class TaskStore:
+    FILTERS = ('All', 'Completed', 'Pending')
+    SORTS = ('None', 'Priority')
+    FORMATS = ('csv', 'jsonl')
+    EXPORT_FIELDS = ('id', 'text', 'completed', 'priority')
+
+    def __init__(self, data_mgr, data):
+        self.data_mgr = data_mgr
+        self.data = data
+        self.index = None if data_mgr.paged else TaskIndex(data['tasks'])
+
+    @staticmethod
+    def matches(task, filter_val):
+        if filter_val == 'Completed': return task['completed']
+        if filter_val == 'Pending': return not task['completed']
+        return True
+
+    @staticmethod
+    def rank(sort_val):
+        if sort_val == 'Priority':
+            return lambda task: -PRIORITY_RANK.get(task.get('priority', 'Medium'), 1)
+        return lambda task: 0
+
+    def matches_view(self, task, filter_val, search=''):
+        return self.matches(task, filter_val) and TaskIndex.matches_search(task, search)
+
+    def entries(self, filter_val, search='', sort_val='None'):
+        ids = self.index.sorted_ids(filter_val, sort_val, search)
+        return list(zip(ids, map(self.index.by_id.__getitem__, ids)))
+
+    def query(self, filter_val='All', sort_val='None', search=''):
+        if self.data_mgr.paged:
+            return self.data_mgr.query_tasks(filter_val, sort_val, search)
+        by_id = self.index.by_id
+        return [by_id[task_id] for task_id in self.index.sorted_ids(filter_val, sort_val, search)]
+
+    def get(self, task_id):
+        return self.data_mgr.get_task(task_id)
+
+    def add(self, text, priority='Medium'):
+        task = Task(text, False, priority)
+        self.data_mgr.add_task(self.data, task)
+        if self.index is not None:
+            self.index.add(task)
+        return task
+
+    def update(self, task, fields):
+        old = dict(task)
+        self.data_mgr.update_task(self.data, task, fields)
+        if self.index is not None:
+            self.index.update(task, old)
+
+    def toggle(self, task):
+        self.update(task, {'completed': not task['completed']})
+        return task['completed']
+
+    def delete(self, task):
+        self.data_mgr.delete_task(self.data, task)
+        if self.index is not None:
+            self.index.remove(task)
+
+    def apply_changes(self, changes):
+        if self.index is None:
+            return
+        if changes['renumbered'] or changes.get('reload'):
+            self.index = TaskIndex(self.data['tasks'])
+            return
+        for task in changes['deleted']:
+            self.index.remove(task)
+        for task in changes['added']:
+            self.index.add(task)
+        for task, old in changes['updated']:
+            self.index.update(task, old)
+
+    @staticmethod
+    def format_for(path):
+        return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+    def iter_tasks(self):
+        if self.data_mgr.paged:
+            return iter(self.data_mgr.query_tasks('All', 'None'))
+        return iter(self.data['tasks'])
+
+    def import_tasks(self, f, fmt, progress=None, cancel=None):
+        report = {'imported': 0, 'rejected': 0, 'errors': []}
+
+        def rows():
+            for count, (line_no, row) in enumerate(read_task_rows(f, fmt), 1):
+                if cancel is not None and cancel.is_set():
+                    raise ImportCancelled()
+                try:
+                    yield parse_task_row(row)
+                except ValueError as e:
+                    report['rejected'] += 1
+                    if len(report['errors']) < IMPORT_MAX_ERRORS:
+                        report['errors'].append(f"line {line_no}: {e}")
+                if progress is not None and count % IMPORT_PROGRESS_EVERY == 0:
+                    progress(count, f.tell())
+
+        added = self.data_mgr.add_tasks(self.data, rows())
+        report['imported'] = len(added)
+        if self.index is not None:
+            for task in added:
+                self.index.add(task)
+        return report
+
+    def export_tasks(self, f, fmt):
+        count = 0
+        if fmt == 'csv':
+            import csv
+            writer = csv.writer(f)
+            writer.writerow(self.EXPORT_FIELDS)
+            for task in self.iter_tasks():
+                writer.writerow((task['id'], task['text'], 'true' if task['completed'] else 'false', task.get('priority', 'Medium')))
+                count += 1
+        else:
+            for task in self.iter_tasks():
+                f.write(json.dumps({'id': task['id'], 'text': task['text'], 'completed': task['completed'],
+                                    'priority': task.get('priority', 'Medium')}, ensure_ascii=False) + '\n')
+                count += 1
+        return count
+
+class TimerEngine:
+    def __init__(self, seconds, mode='Focus', clock=time.monotonic):
+        self.countdown = CountdownTimer(seconds, clock)
+        self.mode = mode
+        self.seconds_left = seconds
+
+    @property
+    def running(self):
+        return self.countdown.running
+
+    def set_mode(self, mode, minutes):
+        self.mode = mode
+        self.reset(minutes * 60)
+
+    def reset(self, seconds):
+        self.seconds_left = seconds
+        self.countdown.reset(seconds)
+
+    def start(self):
+        return self.countdown.start()
+
+    def pause(self):
+        self.countdown.pause()
+
+    def advance(self, now=None):
+        if not self.countdown.running:
+            return 0, False
+        seconds_left = self.countdown.seconds_left(now)
+        if seconds_left == self.seconds_left:
+            return 0, False
+        # count every minute boundary crossed, even if a stall skipped several ticks
+        minutes = (self.seconds_left - 1) // 60 - (seconds_left - 1) // 60
+        self.seconds_left = seconds_left
+        if seconds_left == 0:
+            # re-arm the same period so Start begins it again
+            self.reset(self.countdown.duration)
+            return minutes, True
+        return minutes, False
+
+class ZenTaskCore:
+    def __init__(self, data_mgr=None, events=None, clock=time.monotonic, wall_clock=time.time):
+        self.data_mgr = data_mgr if data_mgr is not None else create_data_manager()
+        self.data = self.data_mgr.load_data()
+        self.events = events if events is not None else EventStore(events_file_for(self.data_mgr.filename))
+        self.wall_clock = wall_clock
+        self.tasks = TaskStore(self.data_mgr, self.data)
+        self.timer = TimerEngine(self.data['timer_settings']['seconds'], self.data['timer_settings']['mode'], clock)
+        self.listeners = []
+        self.revision = 0
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self.listeners.remove(callback)
+
+    def emit(self, kind, **info):
+        # every emitted change bumps the revision that API ETags are built from
+        self.revision += 1
+        for callback in self.listeners:
+            callback(kind, info)
+
+    def save(self):
+        self.sync()
+        self.apply_sync(self.data_mgr.save_data(self.data))
+
+    def sync(self):
+        # merge what other instances saved since we last looked
+        return self.apply_sync(self.data_mgr.sync(self.data))
+
+    def apply_sync(self, changes):
+        if changes is None:
+            return None
+        self.tasks.apply_changes(changes)
+        moved = any(task.get('priority') != old.get('priority') for task, old in changes['updated'])
+        if changes.get('reload') or changes['renumbered'] or moved:
+            self.emit('tasks_reloaded')
+        else:
+            for task in changes['deleted']:
+                self.emit('task_deleted', task=task)
+            for task in changes['added']:
+                self.emit('task_added', task=task)
+            for task, _ in changes['updated']:
+                self.emit('task_updated', task=task)
+        if changes['settings']:
+            self.emit('synced', keys=changes['settings'])
+        return changes
+
+    def close(self):
+        self.apply_sync(self.data_mgr.close())
+        self.events.close()
+
+    def rebuild_rollups(self):
+        # the rollups are derived from the event log, so a lost or damaged copy
+        # in the data file can be recomputed from it
+        self.data['rollups'] = self.events.rebuild()
+        self.save()
+        self.emit('synced', keys=['rollups'])
+
+    def record_event(self, event_type, **fields):
+        event = {'type': event_type, 'ts': self.wall_clock(), **fields}
+        self.events.append(event)
+        self.data_mgr.record_event(self.data, event)
+        self.emit('event', event=event)
+
+    def add_xp(self, amount, reason='focus'):
+        old_level = self.data['level']
+        self.data_mgr.add_xp(self.data, amount)
+        self.record_event('xp', amount=amount, reason=reason)
+        if self.data['level'] > old_level:
+            self.emit('level_up', level=self.data['level'])
+        self.emit('xp', xp=self.data['xp'], level=self.data['level'])
+        self.save()
+
+    def add_task(self, text, priority='Medium'):
+        text = text.strip()
+        if not text:
+            return None
+        task = self.tasks.add(text, priority)
+        self.save()
+        self.emit('task_added', task=task)
+        return task
+
+    def toggle_task(self, task):
+        if self.tasks.toggle(task):
+            self.add_xp(10, 'task')
+        self.save()
+        self.emit('task_updated', task=task)
+
+    def edit_task(self, task, text):
+        text = text.strip()
+        if not text or text == task['text']:
+            return False
+        self.tasks.update(task, {'text': text})
+        self.save()
+        self.emit('task_updated', task=task)
+        return True
+
+    def import_tasks(self, f, fmt, progress=None, cancel=None):
+        report = self.tasks.import_tasks(f, fmt, progress, cancel)
+        if report['imported']:
+            self.save()
+            self.emit('tasks_imported', count=report['imported'])
+        return report
+
+    def export_tasks(self, f, fmt):
+        return self.tasks.export_tasks(f, fmt)
+
+    def delete_task(self, task):
+        self.tasks.delete(task)
+        self.save()
+        self.emit('task_deleted', task=task)
+
+    def tick(self, now=None):
+        minutes, finished = self.timer.advance(now)
+        if minutes > 0 and self.timer.mode == 'Focus':
+            self.add_xp(minutes)
+        if finished:
+            self.finish_period()
+        return finished
+
+    def finish_period(self):
+        mode = self.timer.mode
+        self.emit('period_finished', mode=mode)
+        if mode == 'Focus':
+            self.complete_session()
+
+    def complete_session(self):
+        # the period that just ended, which need not match the focus setting
+        minutes = self.timer.countdown.duration // 60
+        self.data['completed_focus_sessions'] += 1
+        self.data['total_focus_time'] += minutes
+        self.record_event('session', minutes=minutes)
+        self.add_xp(50, 'session')
+        self.save()
+        self.emit('session_complete', minutes=minutes)